@@ -6,6 +6,7 @@ using the OpenAI-compatible format.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import random
 from typing import List, Dict, Any, Optional, Callable
@@ -34,6 +35,10 @@ class DeepSeekClient:
     MAX_DELAY = 30.0  # seconds
     REQUEST_TIMEOUT = 60  # seconds - increased for larger responses
     
+    # Keep-alive connections kept open to the API host. One client is shared
+    # by the script generators and the data parser, so a few may be in use.
+    POOL_MAXSIZE = 10
+    
     def __init__(self, api_key: str, base_url: str = "https://api.deepseek.com"):
         """
         Initialize DeepSeek client with API credentials.
@@ -55,6 +60,19 @@ class DeepSeekClient:
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self):
+        """Close pooled connections held by the HTTP session."""
+        self.session.close()
+    
+    def __enter__(self) -> 'DeepSeekClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _calculate_retry_delay(self, attempt: int) -> float:
         """
@@ -4,11 +4,17 @@ Test script to verify script generation fixes for:
 2. Main content area detection
 3. Proper table data extraction (not navigation links)
 4. Data validation (skip empty/link-only records)
+
+The checks are independent, so under pytest they can run in parallel:
+    pytest -n auto ai_layer/test/test_script_generation_fixes.py
 """
 
 import sys
 import os
 import re
+import traceback
+
+import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -17,67 +23,111 @@ from ai_layer.script_prompt_builders.script_prompt_builder import ScriptPromptBu
 from ai_layer.deepseek_client import DeepSeekClient
 from ai_layer.config import DeepSeekConfig
 from scraping_layer.config import ScrapingConfig
+from bs4 import BeautifulSoup
 
 
-def test_prompt_contains_navigation_filtering():
-    """Test that the system prompt includes navigation filtering instructions."""
-    print("=" * 60)
-    print("TEST 1: Navigation Filtering Instructions")
-    print("=" * 60)
+def _evaluate_checks(checks):
+    """
+    Evaluate ordered (name, check) pairs, stopping at the first failure.
+
+    Checks are zero-argument callables so expensive ones are never run once
+    a cheaper, earlier check has already failed.
+
+    Returns:
+        Tuple of (evaluated (name, result) pairs, skipped names, all_passed)
+    """
+    evaluated = []
+    for index, (check_name, check) in enumerate(checks):
+        result = bool(check())
+        evaluated.append((check_name, result))
+        if not result:
+            return evaluated, [name for name, _ in checks[index + 1:]], False
+    return evaluated, [], True
+
+
+def _format_check_results(evaluated, skipped):
+    """Format evaluated check results followed by any skipped checks."""
+    lines = []
+    for check_name, result in evaluated:
+        status = "✓" if result else "✗"
+        lines.append(f"{status} {check_name}: {result}")
+    for check_name in skipped:
+        lines.append(f"- {check_name}: skipped (earlier check failed)")
+    return lines
+
+
+def _write_lines(lines):
+    """Write buffered test output to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+# Each _check_* helper returns (result, output lines). result is True/False,
+# or None when the check was skipped; the lines are printed by main() and
+# used as the assertion message under pytest.
+
+
+def _check_navigation_filtering():
+    """Check that the system prompt includes navigation filtering instructions."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append("TEST 1: Navigation Filtering Instructions")
+    lines.append("=" * 60)
     
     system_prompt = ScriptPromptBuilder.SYSTEM_PROMPT
+    prompt_lower = system_prompt.lower()
     
-    checks = {
-        'has_navigation_exclusion': 'EXCLUDE NAVIGATION' in system_prompt or 'SKIP' in system_prompt and 'nav' in system_prompt,
-        'has_is_navigation_function': 'is_navigation_element' in system_prompt,
-        'has_main_content_detection': 'main content' in system_prompt.lower() or '#content' in system_prompt,
-        'has_data_validation': 'has_actual_data' in system_prompt or 'validate' in system_prompt.lower(),
-        'mentions_nav_header_footer': '<nav>' in system_prompt and '<header>' in system_prompt and '<footer>' in system_prompt,
-    }
+    # Ordered cheapest-first; evaluation stops at the first failure
+    checks = [
+        ('has_is_navigation_function', lambda: 'is_navigation_element' in system_prompt),
+        ('has_navigation_exclusion', lambda: 'EXCLUDE NAVIGATION' in system_prompt or 'SKIP' in system_prompt and 'nav' in system_prompt),
+        ('mentions_nav_header_footer', lambda: '<nav>' in system_prompt and '<header>' in system_prompt and '<footer>' in system_prompt),
+        ('has_main_content_detection', lambda: 'main content' in prompt_lower or '#content' in system_prompt),
+        ('has_data_validation', lambda: 'has_actual_data' in system_prompt or 'validate' in prompt_lower),
+    ]
     
-    print("\nChecking system prompt for key instructions:")
-    for check_name, result in checks.items():
-        status = "✓" if result else "✗"
-        print(f"{status} {check_name}: {result}")
+    lines.append("\nChecking system prompt for key instructions:")
+    evaluated, skipped, all_passed = _evaluate_checks(checks)
+    lines.extend(_format_check_results(evaluated, skipped))
     
-    all_passed = all(checks.values())
-    print(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: All navigation filtering instructions present")
+    lines.append(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: All navigation filtering instructions present")
     
-    return all_passed
+    return all_passed, lines
 
 
-def test_prompt_contains_table_extraction_rules():
-    """Test that the system prompt includes proper table extraction rules."""
-    print("\n" + "=" * 60)
-    print("TEST 2: Table Extraction Rules")
-    print("=" * 60)
+def _check_table_extraction_rules():
+    """Check that the system prompt includes proper table extraction rules."""
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 2: Table Extraction Rules")
+    lines.append("=" * 60)
     
     system_prompt = ScriptPromptBuilder.SYSTEM_PROMPT
+    prompt_lower = system_prompt.lower()
     
-    checks = {
-        'has_table_detection': 'table' in system_prompt.lower() and 'detect' in system_prompt.lower(),
-        'has_cell_text_extraction': 'get_text' in system_prompt or 'cell' in system_prompt.lower(),
-        'has_header_extraction': 'header' in system_prompt.lower() and 'thead' in system_prompt,
-        'has_financial_selectors': 'ipo' in system_prompt.lower() or 'stock' in system_prompt.lower(),
-        'skip_navigation_tables': 'skip' in system_prompt.lower() and 'navigation' in system_prompt.lower(),
-    }
+    # Ordered cheapest-first; evaluation stops at the first failure
+    checks = [
+        ('has_cell_text_extraction', lambda: 'get_text' in system_prompt or 'cell' in prompt_lower),
+        ('has_header_extraction', lambda: 'thead' in system_prompt and 'header' in prompt_lower),
+        ('has_table_detection', lambda: 'table' in prompt_lower and 'detect' in prompt_lower),
+        ('has_financial_selectors', lambda: 'ipo' in prompt_lower or 'stock' in prompt_lower),
+        ('skip_navigation_tables', lambda: 'skip' in prompt_lower and 'navigation' in prompt_lower),
+    ]
     
-    print("\nChecking system prompt for table extraction rules:")
-    for check_name, result in checks.items():
-        status = "✓" if result else "✗"
-        print(f"{status} {check_name}: {result}")
+    lines.append("\nChecking system prompt for table extraction rules:")
+    evaluated, skipped, all_passed = _evaluate_checks(checks)
+    lines.extend(_format_check_results(evaluated, skipped))
     
-    all_passed = all(checks.values())
-    print(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: All table extraction rules present")
+    lines.append(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: All table extraction rules present")
     
-    return all_passed
+    return all_passed, lines
 
 
-def test_user_prompt_generation():
-    """Test that user prompts include critical reminders."""
-    print("\n" + "=" * 60)
-    print("TEST 3: User Prompt Generation")
-    print("=" * 60)
+def _check_user_prompt_generation():
+    """Check that user prompts include critical reminders."""
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 3: User Prompt Generation")
+    lines.append("=" * 60)
     
     try:
         scraping_config = ScrapingConfig.from_env()
@@ -94,47 +144,47 @@ def test_user_prompt_generation():
         
         messages = builder.build_script_prompt(form_input)
         
-        print(f"\n✓ Generated {len(messages)} messages")
+        lines.append(f"\n✓ Generated {len(messages)} messages")
         
         # Check system message
         system_msg = messages[0]['content']
-        print(f"✓ System message length: {len(system_msg)} chars")
+        lines.append(f"✓ System message length: {len(system_msg)} chars")
         
         # Check user message
         user_msg = messages[1]['content']
-        print(f"✓ User message length: {len(user_msg)} chars")
+        lines.append(f"✓ User message length: {len(user_msg)} chars")
         
-        # Check for critical reminders in user message
-        checks = {
-            'has_critical_reminders': 'CRITICAL REMINDERS' in user_msg or 'CRITICAL' in user_msg,
-            'mentions_skip_navigation': 'SKIP' in user_msg and 'NAVIGATION' in user_msg,
-            'mentions_main_data_table': 'MAIN DATA TABLE' in user_msg or 'main' in user_msg.lower(),
-            'mentions_extract_cell_text': 'CELL TEXT' in user_msg or 'text content' in user_msg.lower(),
-            'mentions_validate_data': 'VALIDATE' in user_msg or 'validate' in user_msg.lower(),
-            'includes_user_url': 'chittorgarh.com' in user_msg,
-            'includes_required_fields': 'company_name' in user_msg and 'gmp' in user_msg,
-        }
+        # Check for critical reminders in user message, cheapest-first;
+        # evaluation stops at the first failure
+        checks = [
+            ('has_critical_reminders', lambda: 'CRITICAL' in user_msg),
+            ('mentions_skip_navigation', lambda: 'SKIP' in user_msg and 'NAVIGATION' in user_msg),
+            ('mentions_validate_data', lambda: 'VALIDATE' in user_msg or 'validate' in user_msg.lower()),
+            ('mentions_main_data_table', lambda: 'MAIN DATA TABLE' in user_msg or 'main' in user_msg.lower()),
+            ('mentions_extract_cell_text', lambda: 'CELL TEXT' in user_msg or 'text content' in user_msg.lower()),
+            ('includes_required_fields', lambda: 'company_name' in user_msg and 'gmp' in user_msg),
+            ('includes_user_url', lambda: 'chittorgarh.com' in user_msg),
+        ]
         
-        print("\nChecking user prompt for critical elements:")
-        for check_name, result in checks.items():
-            status = "✓" if result else "✗"
-            print(f"{status} {check_name}: {result}")
+        lines.append("\nChecking user prompt for critical elements:")
+        evaluated, skipped, all_passed = _evaluate_checks(checks)
+        lines.extend(_format_check_results(evaluated, skipped))
         
-        all_passed = all(checks.values())
-        print(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: User prompt contains all critical elements")
+        lines.append(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: User prompt contains all critical elements")
         
-        return all_passed
+        return all_passed, lines
         
     except Exception as e:
-        print(f"\n✗ FAILED: Error generating prompt: {e}")
-        return False
+        lines.append(f"\n✗ FAILED: Error generating prompt: {e}")
+        return False, lines
 
 
-def test_generated_script_structure():
-    """Test that generated scripts have the required structure."""
-    print("\n" + "=" * 60)
-    print("TEST 4: Generated Script Structure (with API)")
-    print("=" * 60)
+def _check_generated_script_structure():
+    """Check that generated scripts have the required structure."""
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 4: Generated Script Structure (with API)")
+    lines.append("=" * 60)
     
     try:
         config = DeepSeekConfig.from_env()
@@ -142,8 +192,8 @@ def test_generated_script_structure():
         client = DeepSeekClient(config.api_key, config.base_url)
         builder = ScriptPromptBuilder(scraping_config)
     except Exception as e:
-        print(f"\n⚠️ Skipping API test - configuration error: {e}")
-        return None
+        lines.append(f"\n⚠️ Skipping API test - configuration error: {e}")
+        return None, lines
     
     # Test with IPO data requirements
     form_input = {
@@ -154,7 +204,7 @@ def test_generated_script_structure():
         'update_frequency': 'Daily'
     }
     
-    print("\nGenerating script with DeepSeek API...")
+    lines.append("\nGenerating script with DeepSeek API...")
     messages = builder.build_script_prompt(form_input)
     
     try:
@@ -165,71 +215,70 @@ def test_generated_script_structure():
             max_tokens=8000
         )
         
-        print(f"✓ Script generated ({len(script_code)} chars)")
+        lines.append(f"✓ Script generated ({len(script_code)} chars)")
         
         # Check for required functions and patterns
-        checks = {
-            'has_imports': 'import requests' in script_code and 'from bs4 import BeautifulSoup' in script_code,
-            'has_is_navigation_element': 'def is_navigation_element' in script_code,
-            'has_has_actual_data': 'def has_actual_data' in script_code,
-            'has_clean_header': 'def clean_header' in script_code,
-            'has_get_text_safe': 'def get_text_safe' in script_code,
-            'has_scrape_data': 'def scrape_data' in script_code,
-            'has_scrape_table_data': 'def scrape_table_data' in script_code,
-            'has_detect_strategy': 'def detect_scraping_strategy' in script_code,
-            'checks_navigation': 'is_navigation_element(' in script_code,
-            'finds_main_content': 'main' in script_code or '#content' in script_code,
-            'extracts_cell_text': 'get_text' in script_code,
-            'validates_data': 'has_actual_data' in script_code,
-            'has_default_urls': 'DEFAULT_URLS' in script_code,
-            'includes_user_url': 'chittorgarh.com' in script_code,
-            'has_proper_headers': 'Accept' in script_code and 'Accept-Language' in script_code,
-        }
+        # Ordered so that broad checks fail fast; evaluation stops at the first failure
+        checks = [
+            ('has_imports', lambda: 'import requests' in script_code and 'from bs4 import BeautifulSoup' in script_code),
+            ('has_default_urls', lambda: 'DEFAULT_URLS' in script_code),
+            ('has_scrape_data', lambda: 'def scrape_data' in script_code),
+            ('extracts_cell_text', lambda: 'get_text' in script_code),
+            ('finds_main_content', lambda: 'main' in script_code or '#content' in script_code),
+            ('has_is_navigation_element', lambda: 'def is_navigation_element' in script_code),
+            ('checks_navigation', lambda: 'is_navigation_element(' in script_code),
+            ('has_has_actual_data', lambda: 'def has_actual_data' in script_code),
+            ('validates_data', lambda: 'has_actual_data' in script_code),
+            ('has_clean_header', lambda: 'def clean_header' in script_code),
+            ('has_get_text_safe', lambda: 'def get_text_safe' in script_code),
+            ('has_scrape_table_data', lambda: 'def scrape_table_data' in script_code),
+            ('has_detect_strategy', lambda: 'def detect_scraping_strategy' in script_code),
+            ('has_proper_headers', lambda: 'Accept' in script_code and 'Accept-Language' in script_code),
+            ('includes_user_url', lambda: 'chittorgarh.com' in script_code),
+        ]
         
-        print("\nChecking generated script structure:")
-        for check_name, result in checks.items():
-            status = "✓" if result else "✗"
-            print(f"{status} {check_name}: {result}")
+        lines.append("\nChecking generated script structure:")
+        evaluated, skipped, all_passed = _evaluate_checks(checks)
+        lines.extend(_format_check_results(evaluated, skipped))
         
         # Count critical patterns
         nav_checks = script_code.count('is_navigation_element')
         main_content_refs = script_code.count('main_content') + script_code.count('#content')
         
-        print(f"\nPattern counts:")
-        print(f"  - Navigation checks: {nav_checks}")
-        print(f"  - Main content references: {main_content_refs}")
+        lines.append(f"\nPattern counts:")
+        lines.append(f"  - Navigation checks: {nav_checks}")
+        lines.append(f"  - Main content references: {main_content_refs}")
         
         # Show a snippet of the table extraction function
         if 'def scrape_table_data' in script_code:
             start = script_code.find('def scrape_table_data')
             end = script_code.find('\ndef ', start + 1)
             snippet = script_code[start:end] if end > start else script_code[start:start+500]
-            print(f"\n--- scrape_table_data snippet ---")
-            print(snippet[:400] + "..." if len(snippet) > 400 else snippet)
+            lines.append(f"\n--- scrape_table_data snippet ---")
+            lines.append(snippet[:400] + "..." if len(snippet) > 400 else snippet)
         
-        all_passed = all(checks.values())
-        print(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: Generated script has required structure")
+        lines.append(f"\n{'✓ PASSED' if all_passed else '✗ FAILED'}: Generated script has required structure")
         
         # Save script for manual inspection
         output_file = 'ai_layer/test/generated_script_sample.py'
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(script_code)
-        print(f"\n✓ Script saved to: {output_file}")
+        lines.append(f"\n✓ Script saved to: {output_file}")
         
-        return all_passed
+        return all_passed, lines
         
     except Exception as e:
-        print(f"\n✗ FAILED: Error generating script: {e}")
-        import traceback
-        print(traceback.format_exc())
-        return False
+        lines.append(f"\n✗ FAILED: Error generating script: {e}")
+        lines.append(traceback.format_exc())
+        return False, lines
 
 
-def test_script_execution_mock():
-    """Test that the generated script logic would work correctly (mock test)."""
-    print("\n" + "=" * 60)
-    print("TEST 5: Script Logic Validation (Mock)")
-    print("=" * 60)
+def _check_script_execution_mock():
+    """Check that the generated script logic would work correctly (mock test)."""
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("TEST 5: Script Logic Validation (Mock)")
+    lines.append("=" * 60)
     
     # Simulate HTML with navigation and data table
     mock_html = """
@@ -270,32 +319,30 @@ def test_script_execution_mock():
     </html>
     """
     
-    from bs4 import BeautifulSoup
-    
     soup = BeautifulSoup(mock_html, 'lxml')
     
     # Test 1: Find main content
     main_content = soup.select_one('main, #content, .content')
-    print(f"\n✓ Found main content: {main_content is not None}")
+    lines.append(f"\n✓ Found main content: {main_content is not None}")
     
     # Test 2: Find data table (not navigation)
     if main_content:
         tables = main_content.select('table')
-        print(f"✓ Found {len(tables)} table(s) in main content")
+        lines.append(f"✓ Found {len(tables)} table(s) in main content")
         
         # Test 3: Check table is not in navigation
         for table in tables:
             in_nav = table.find_parent(['nav', 'header', 'footer']) is not None
-            print(f"✓ Table is {'IN' if in_nav else 'NOT in'} navigation: {not in_nav}")
+            lines.append(f"✓ Table is {'IN' if in_nav else 'NOT in'} navigation: {not in_nav}")
         
         # Test 4: Extract data from table
         if tables:
             table = tables[0]
             headers = [th.get_text(strip=True) for th in table.select('th')]
-            print(f"✓ Extracted headers: {headers}")
+            lines.append(f"✓ Extracted headers: {headers}")
             
             rows = table.select('tbody tr')
-            print(f"✓ Found {len(rows)} data rows")
+            lines.append(f"✓ Found {len(rows)} data rows")
             
             data = []
             for row in rows:
@@ -308,26 +355,67 @@ def test_script_execution_mock():
                             record[headers[i]] = text
                     data.append(record)
             
-            print(f"✓ Extracted {len(data)} records")
+            lines.append(f"✓ Extracted {len(data)} records")
             
             # Test 5: Verify data quality
             if data:
-                print("\n--- Sample extracted data ---")
+                lines.append("\n--- Sample extracted data ---")
                 for i, record in enumerate(data[:2], 1):
-                    print(f"Record {i}: {record}")
+                    lines.append(f"Record {i}: {record}")
                 
                 # Check that records have actual data
                 has_company_names = all('Company Name' in r and r['Company Name'] for r in data)
                 has_prices = all('IPO Price' in r and r['IPO Price'] for r in data)
                 
-                print(f"\n✓ All records have company names: {has_company_names}")
-                print(f"✓ All records have IPO prices: {has_prices}")
+                lines.append(f"\n✓ All records have company names: {has_company_names}")
+                lines.append(f"✓ All records have IPO prices: {has_prices}")
                 
-                print(f"\n✓ PASSED: Mock script logic works correctly")
-                return True
+                lines.append(f"\n✓ PASSED: Mock script logic works correctly")
+                return True, lines
     
-    print(f"\n✗ FAILED: Mock script logic failed")
-    return False
+    lines.append(f"\n✗ FAILED: Mock script logic failed")
+    return False, lines
+
+
+# Pytest entry points - each check is independent and safe to run under pytest-xdist
+
+def test_prompt_contains_navigation_filtering():
+    """Test that the system prompt includes navigation filtering instructions."""
+    passed, lines = _check_navigation_filtering()
+    assert passed, "\n".join(lines)
+
+
+def test_prompt_contains_table_extraction_rules():
+    """Test that the system prompt includes proper table extraction rules."""
+    passed, lines = _check_table_extraction_rules()
+    assert passed, "\n".join(lines)
+
+
+def test_user_prompt_generation():
+    """Test that user prompts include critical reminders."""
+    passed, lines = _check_user_prompt_generation()
+    assert passed, "\n".join(lines)
+
+
+def test_generated_script_structure():
+    """Test that generated scripts have the required structure."""
+    passed, lines = _check_generated_script_structure()
+    if passed is None:
+        pytest.skip("DeepSeek API not configured")
+    assert passed, "\n".join(lines)
+
+
+def test_script_execution_mock():
+    """Test that the generated script logic would work correctly (mock test)."""
+    passed, lines = _check_script_execution_mock()
+    assert passed, "\n".join(lines)
+
+
+def _run_check(check):
+    """Run a check for main(), printing its output and returning its result."""
+    result, lines = check()
+    _write_lines(lines)
+    return result
 
 
 def main():
@@ -339,19 +427,19 @@ def main():
     results = {}
     
     # Test 1: Prompt contains navigation filtering
-    results['navigation_filtering'] = test_prompt_contains_navigation_filtering()
+    results['navigation_filtering'] = _run_check(_check_navigation_filtering)
     
     # Test 2: Prompt contains table extraction rules
-    results['table_extraction'] = test_prompt_contains_table_extraction_rules()
+    results['table_extraction'] = _run_check(_check_table_extraction_rules)
     
     # Test 3: User prompt generation
-    results['user_prompt'] = test_user_prompt_generation()
+    results['user_prompt'] = _run_check(_check_user_prompt_generation)
     
     # Test 4: Generated script structure (API test)
-    results['script_structure'] = test_generated_script_structure()
+    results['script_structure'] = _run_check(_check_generated_script_structure)
     
     # Test 5: Script logic validation (mock)
-    results['script_logic'] = test_script_execution_mock()
+    results['script_logic'] = _run_check(_check_script_execution_mock)
     
     # Summary
     print("\n" + "=" * 60)
@@ -0,0 +1,26 @@
+"""
+ASGI entry point for running the API server as its own process.
+
+APIServer runs uvicorn on a thread inside the Streamlit process, sharing
+its GIL. For heavier traffic, run the app in separate worker processes
+that read the same SQLite database instead:
+
+    gunicorn -c gunicorn_conf.py api_server.asgi:app
+
+Environment variables:
+    API_SERVER_DB_PATH: Database file (default: data/endpoints.db)
+    API_SERVER_BASE_URL: Public base URL used in access URLs
+        (default: http://127.0.0.1:8080)
+"""
+
+import os
+
+from api_server.data_store import DataStore
+from api_server.server import app, configure
+
+configure(
+    DataStore(os.environ.get('API_SERVER_DB_PATH', DataStore.DEFAULT_DB_PATH)),
+    os.environ.get('API_SERVER_BASE_URL', 'http://127.0.0.1:8080').rstrip('/')
+)
+
+__all__ = ['app']
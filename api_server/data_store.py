@@ -5,11 +5,17 @@ This module provides the DataStore class that handles all database
 operations for storing and retrieving API endpoint data.
 """
 
+import dataclasses
+import logging
+import re
+import secrets
 import sqlite3
-import json
-import uuid
-from datetime import datetime
-from typing import Optional, List
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Tuple, Union, Iterator
 from pathlib import Path
 
 from api_server.models import (
@@ -18,6 +24,44 @@ from api_server.models import (
     EndpointInfo,
     EndpointCreationError
 )
+from api_server import serialization
+
+logger = logging.getLogger(__name__)
+
+# Incremental BLOB I/O (Connection.blobopen) is available from Python 3.11
+HAS_BLOBOPEN = hasattr(sqlite3.Connection, 'blobopen')
+
+# Used by DataStore.generate_endpoint_id to pick keywords from a description
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'this', 'that', 'these', 'those', 'what', 'which', 'who', 'when',
+    'where', 'why', 'how', 'all', 'each', 'every', 'both', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own',
+    'same', 'so', 'than', 'too', 'very', 'can', 'will', 'just', 'should',
+    'now', 'get', 'list', 'data', 'api', 'endpoint'
+})
+
+# Timestamps are stored as integer microseconds since the Unix epoch.
+# Models use naive UTC datetimes, so arithmetic stays naive as well.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(dt: datetime) -> int:
+    """Convert a naive UTC (or aware) datetime to epoch microseconds."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: Union[int, str]) -> datetime:
+    """Convert stored epoch microseconds back to a naive UTC datetime."""
+    if isinstance(value, str):
+        # Rows written before schema v3 hold ISO 8601 strings
+        return datetime.fromisoformat(value)
+    return _EPOCH + timedelta(microseconds=value)
 
 
 class DataStore:
@@ -25,38 +69,254 @@ class DataStore:
     
     DEFAULT_DB_PATH = "data/endpoints.db"
     
-    def __init__(self, db_path: str = None):
+    # Stored in PRAGMA user_version; older databases are migrated on open
+    SCHEMA_VERSION = 4
+    
+    # Applied to every new connection when fast_mode is enabled.
+    # WAL avoids the double fsync of the rollback journal and lets readers
+    # proceed while a write is in progress.
+    FAST_MODE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+    )
+    
+    # Payloads live in their own table so scans of the (small) metadata
+    # rows in list_endpoints never touch the pages holding large JSON blobs
+    _SQL_INSERT = '''
+        INSERT INTO endpoints (
+            endpoint_id, description, source_urls,
+            records_count, fields, parsing_timestamp, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    _SQL_INSERT_PAYLOAD = '''
+        INSERT INTO endpoint_payloads (endpoint_id, json_data) VALUES (?, ?)
+    '''
+    _SQL_INSERT_PAYLOAD_ZEROBLOB = '''
+        INSERT INTO endpoint_payloads (endpoint_id, json_data) VALUES (?, zeroblob(?))
+    '''
+    _SQL_GET_PAYLOAD_ROWID = 'SELECT rowid FROM endpoint_payloads WHERE endpoint_id = ?'
+    _SQL_GET_PAYLOAD = 'SELECT json_data FROM endpoint_payloads WHERE endpoint_id = ?'
+    _SQL_GET_PAYLOAD_SIZE = 'SELECT length(json_data) FROM endpoint_payloads WHERE endpoint_id = ?'
+    _SQL_GET = '''
+        SELECT e.endpoint_id, p.json_data, e.description, e.source_urls,
+               e.records_count, e.fields, e.parsing_timestamp, e.created_at
+        FROM endpoints e
+        JOIN endpoint_payloads p ON p.endpoint_id = e.endpoint_id
+        WHERE e.endpoint_id = ?
+    '''
+    _SQL_GET_INFO = '''
+        SELECT endpoint_id, description, records_count, created_at
+        FROM endpoints
+        WHERE endpoint_id = ?
+    '''
+    _SQL_LIST = '''
+        SELECT endpoint_id, description, records_count, created_at
+        FROM endpoints
+        ORDER BY created_at DESC
+    '''
+    # Same rows as _SQL_LIST, assembled into a JSON array by SQLite itself.
+    # created_at is rendered like datetime.isoformat() (microseconds only
+    # when non-zero) so the output matches EndpointInfo.to_dict().
+    _SQL_LIST_JSON = '''
+        SELECT json_group_array(json_object(
+            'endpoint_id', endpoint_id,
+            'access_url', ? || endpoint_id,
+            'description', coalesce(description, ''),
+            'created_at', strftime('%Y-%m-%dT%H:%M:%S', created_at / 1000000, 'unixepoch')
+                || CASE WHEN created_at % 1000000
+                        THEN printf('.%06d', created_at % 1000000) ELSE '' END,
+            'records_count', coalesce(records_count, 0)
+        ))
+        FROM (
+            SELECT endpoint_id, description, records_count, created_at
+            FROM endpoints
+            ORDER BY created_at DESC
+        )
+    '''
+    _SQL_DELETE = 'DELETE FROM endpoints WHERE endpoint_id = ?'
+    _SQL_DELETE_PAYLOAD = 'DELETE FROM endpoint_payloads WHERE endpoint_id = ?'
+    
+    # Size of sqlite3's per-connection prepared statement cache
+    STATEMENT_CACHE_SIZE = 128
+    
+    # Payloads larger than this are written in BLOB_CHUNK_SIZE pieces through
+    # incremental BLOB I/O instead of being bound as one parameter
+    BLOB_STREAM_THRESHOLD = 1024 * 1024
+    BLOB_CHUNK_SIZE = 64 * 1024
+    
+    DEFAULT_CACHE_SIZE = 256
+    DEFAULT_CACHE_TTL = 300.0  # seconds
+    
+    def __init__(
+        self,
+        db_path: str = None,
+        fast_mode: bool = True,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL
+    ):
         """
         Initialize database connection and create tables.
         
         Args:
             db_path: Path to SQLite database file. Defaults to data/endpoints.db
+            fast_mode: Apply WAL journaling and relaxed fsync pragmas (default: True)
+            cache_size: Max parsed endpoints kept in the LRU cache (0 disables it)
+            cache_ttl: Seconds a cached endpoint stays valid
         """
         self.db_path = db_path or self.DEFAULT_DB_PATH
+        self.fast_mode = fast_mode
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
         
         # Ensure directory exists
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
         
+        # One shared write connection (serialized by _write_lock) plus one
+        # read connection per thread, so concurrent readers don't queue
+        # behind a single connection. An in-memory database only exists
+        # on its own connection, so readers share the writer there.
         self._connection = None
+        self._write_lock = threading.RLock()
+        self._read_connections: Dict[int, sqlite3.Connection] = {}
+        self._read_lock = threading.Lock()
+        self._share_write_connection = self.db_path == ':memory:'
+        # Set while a batch() transaction is open; only read under _write_lock
+        self._in_batch = False
+        # Bumped after every committed write so callers can invalidate
+        # anything derived from the stored data (see server response cache)
+        self.version = 0
+        
+        # LRU keyed by endpoint_id: (expires_at, change_token, payload, data).
+        # Hits rebuild json_data from the payload bytes, so callers never
+        # share (and cannot mutate) the cached objects.
+        self._cache: "OrderedDict[str, Tuple[float, tuple, bytes, EndpointData]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new database connection."""
+        # Autocommit mode - transactions are opened explicitly where needed
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        if self.fast_mode:
+            for pragma in self.FAST_MODE_PRAGMAS:
+                conn.execute(pragma)
+        return conn
+    
     def _get_connection(self) -> sqlite3.Connection:
-        """Get or create database connection."""
+        """Get or create the shared write connection."""
         if self._connection is None:
-            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._connection.row_factory = sqlite3.Row
+            with self._write_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
         return self._connection
     
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """Get or create the read connection for the current thread."""
+        if self._share_write_connection:
+            return self._get_connection()
+        
+        thread_id = threading.get_ident()
+        conn = self._read_connections.get(thread_id)
+        if conn is None:
+            conn = self._connect()
+            with self._read_lock:
+                self._prune_read_connections()
+                self._read_connections[thread_id] = conn
+        return conn
+    
+    def _prune_read_connections(self):
+        """Close read connections owned by threads that have exited."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in [tid for tid in self._read_connections if tid not in alive]:
+            self._read_connections.pop(thread_id).close()
+    
     def _init_database(self):
-        """Initialize database schema."""
+        """Initialize database schema, migrating older databases in place."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        with self._write_lock:
+            version, table_exists = self._read_schema_state(cursor)
+            if table_exists and version >= self.SCHEMA_VERSION:
+                return
+            
+            # Several processes (e.g. Gunicorn workers) may open a new or
+            # old database at once, so re-read the state under the write
+            # lock: only the first one creates or migrates the schema
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                version, table_exists = self._read_schema_state(cursor)
+                if table_exists and version >= self.SCHEMA_VERSION:
+                    cursor.execute("COMMIT")
+                    return
+                if table_exists:
+                    for target_version in range(version + 1, self.SCHEMA_VERSION + 1):
+                        logger.debug("Migrating %s to schema v%d", self.db_path, target_version)
+                        getattr(self, f'_migrate_to_v{target_version}')(cursor)
+                else:
+                    self._create_schema(cursor)
+                cursor.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            except sqlite3.Error:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+    
+    @staticmethod
+    def _read_schema_state(cursor: sqlite3.Cursor) -> Tuple[int, bool]:
+        """Return (PRAGMA user_version, whether the endpoints table exists)."""
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        table_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'endpoints'"
+        ).fetchone() is not None
+        return version, table_exists
+    
+    @staticmethod
+    def _create_schema(cursor: sqlite3.Cursor):
+        """Create the current schema in an empty database."""
+        cursor.execute('''
+            CREATE TABLE endpoints (
+                endpoint_id TEXT PRIMARY KEY,
+                description TEXT,
+                source_urls TEXT,
+                records_count INTEGER,
+                fields TEXT,
+                parsing_timestamp INTEGER,
+                created_at INTEGER NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE endpoint_payloads (
+                endpoint_id TEXT PRIMARY KEY,
+                json_data BLOB NOT NULL
+            )
+        ''')
+        
+        # Covers every column _SQL_LIST reads, so listing is an index-only scan
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS endpoints (
+            CREATE INDEX idx_list_cover
+            ON endpoints(created_at DESC, endpoint_id, description, records_count)
+        ''')
+    
+    @staticmethod
+    def _migrate_to_v1(cursor: sqlite3.Cursor):
+        """Store json_data as a BLOB of UTF-8 JSON instead of TEXT."""
+        cursor.execute('ALTER TABLE endpoints RENAME TO endpoints_v0')
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
+        cursor.execute('''
+            CREATE TABLE endpoints (
                 endpoint_id TEXT PRIMARY KEY,
-                json_data TEXT NOT NULL,
+                json_data BLOB NOT NULL,
                 description TEXT,
                 source_urls TEXT,
                 records_count INTEGER,
@@ -65,13 +325,162 @@ class DataStore:
                 created_at TEXT NOT NULL
             )
         ''')
+        cursor.execute('CREATE INDEX idx_created_at ON endpoints(created_at)')
+        cursor.execute('''
+            INSERT INTO endpoints (
+                endpoint_id, json_data, description, source_urls,
+                records_count, fields, parsing_timestamp, created_at
+            )
+            SELECT endpoint_id, CAST(json_data AS BLOB), description, source_urls,
+                   records_count, fields, parsing_timestamp, created_at
+            FROM endpoints_v0
+        ''')
+        cursor.execute('DROP TABLE endpoints_v0')
+    
+    @staticmethod
+    def _migrate_to_v2(cursor: sqlite3.Cursor):
+        """Move json_data out of the endpoints table into endpoint_payloads."""
+        cursor.execute('ALTER TABLE endpoints RENAME TO endpoints_v1')
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
+        cursor.execute('''
+            CREATE TABLE endpoints (
+                endpoint_id TEXT PRIMARY KEY,
+                description TEXT,
+                source_urls TEXT,
+                records_count INTEGER,
+                fields TEXT,
+                parsing_timestamp TEXT,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE endpoint_payloads (
+                endpoint_id TEXT PRIMARY KEY,
+                json_data BLOB NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX idx_created_at ON endpoints(created_at)')
+        cursor.execute('''
+            INSERT INTO endpoints (
+                endpoint_id, description, source_urls,
+                records_count, fields, parsing_timestamp, created_at
+            )
+            SELECT endpoint_id, description, source_urls,
+                   records_count, fields, parsing_timestamp, created_at
+            FROM endpoints_v1
+        ''')
+        cursor.execute('''
+            INSERT INTO endpoint_payloads (endpoint_id, json_data)
+            SELECT endpoint_id, json_data FROM endpoints_v1
+        ''')
+        cursor.execute('DROP TABLE endpoints_v1')
+    
+    @staticmethod
+    def _migrate_to_v3(cursor: sqlite3.Cursor):
+        """Store parsing_timestamp and created_at as epoch microseconds."""
+        cursor.execute('ALTER TABLE endpoints RENAME TO endpoints_v2')
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
+        cursor.execute('''
+            CREATE TABLE endpoints (
+                endpoint_id TEXT PRIMARY KEY,
+                description TEXT,
+                source_urls TEXT,
+                records_count INTEGER,
+                fields TEXT,
+                parsing_timestamp INTEGER,
+                created_at INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX idx_created_at ON endpoints(created_at)')
         
+        # Converted in Python: SQLite's julianday() is a double and would
+        # lose the microseconds
+        rows = cursor.execute('''
+            SELECT endpoint_id, description, source_urls,
+                   records_count, fields, parsing_timestamp, created_at
+            FROM endpoints_v2
+        ''').fetchall()
+        cursor.executemany(
+            '''
+            INSERT INTO endpoints (
+                endpoint_id, description, source_urls,
+                records_count, fields, parsing_timestamp, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''',
+            [
+                (
+                    *row[:5],
+                    _to_epoch_us(datetime.fromisoformat(row[5])) if row[5] else None,
+                    _to_epoch_us(datetime.fromisoformat(row[6]))
+                )
+                for row in rows
+            ]
+        )
+        cursor.execute('DROP TABLE endpoints_v2')
+    
+    @staticmethod
+    def _migrate_to_v4(cursor: sqlite3.Cursor):
+        """Replace idx_created_at with a covering index for list_endpoints."""
+        cursor.execute('DROP INDEX IF EXISTS idx_created_at')
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_created_at 
-            ON endpoints(created_at)
+            CREATE INDEX idx_list_cover
+            ON endpoints(created_at DESC, endpoint_id, description, records_count)
         ''')
+        cursor.execute('ANALYZE endpoints')
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several writes into a single transaction (one commit).
+        
+        store_endpoint, store_endpoints_bulk and delete_endpoint calls made
+        inside the block join this transaction instead of committing on
+        their own. Other threads' writes wait until the block exits.
         
-        conn.commit()
+        Example:
+            with data_store.batch():
+                for endpoint in endpoints:
+                    data_store.store_endpoint(endpoint)
+        
+        Raises:
+            Any exception raised inside the block, after rolling back
+        """
+        with self._write_lock:
+            if self._in_batch:
+                # Nested batch joins the outer transaction
+                yield
+                return
+            
+            cursor = self._get_connection().cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            self._in_batch = True
+            try:
+                yield
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            else:
+                cursor.execute("COMMIT")
+                self.version += 1
+            finally:
+                self._in_batch = False
+    
+    @contextmanager
+    def _write_transaction(self, cursor: sqlite3.Cursor):
+        """Run a write in its own transaction, or in the open batch()."""
+        with self._write_lock:
+            if self._in_batch:
+                yield
+                return
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            self.version += 1
     
     def store_endpoint(self, endpoint_data: EndpointData) -> str:
         """
@@ -86,40 +495,79 @@ class DataStore:
         Raises:
             EndpointCreationError: If storage fails
         """
-        print(f"[DataStore] store_endpoint() called for id={endpoint_data.endpoint_id}")
+        logger.debug("store_endpoint() called for id=%s", endpoint_data.endpoint_id)
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             
-            json_data_str = json.dumps(endpoint_data.json_data, default=str)
-            print(f"[DataStore] JSON data size: {len(json_data_str)} bytes")
-            
-            cursor.execute('''
-                INSERT INTO endpoints (
-                    endpoint_id, json_data, description, source_urls,
-                    records_count, fields, parsing_timestamp, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                endpoint_data.endpoint_id,
-                json_data_str,
-                endpoint_data.metadata.description,
-                json.dumps(endpoint_data.metadata.source_urls),
-                endpoint_data.metadata.records_count,
-                json.dumps(endpoint_data.metadata.fields),
-                endpoint_data.metadata.parsing_timestamp.isoformat(),
-                endpoint_data.created_at.isoformat()
-            ))
+            payload = serialization.dumps_bytes(endpoint_data.json_data)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("JSON data size: %d bytes", len(payload))
             
-            conn.commit()
-            print(f"[DataStore] ✅ Endpoint {endpoint_data.endpoint_id} stored successfully")
+            with self._write_transaction(cursor):
+                cursor.execute(self._SQL_INSERT, self._endpoint_to_row(endpoint_data))
+                self._insert_payload(conn, cursor, endpoint_data.endpoint_id, payload)
+            self._cache_invalidate(endpoint_data.endpoint_id)
+            logger.debug("Endpoint %s stored successfully", endpoint_data.endpoint_id)
             return endpoint_data.endpoint_id
             
         except sqlite3.Error as e:
-            print(f"[DataStore] ❌ SQLite error: {e}")
+            logger.debug("SQLite error storing %s: %s", endpoint_data.endpoint_id, e)
             raise EndpointCreationError(
                 f"Failed to store endpoint: {str(e)}",
                 details=str(e)
             )
+        except (TypeError, ValueError) as e:
+            # orjson.JSONEncodeError is a TypeError; the json fallback raises
+            # ValueError for circular references
+            logger.debug("Could not serialize %s: %s", endpoint_data.endpoint_id, e)
+            raise EndpointCreationError(
+                f"Failed to serialize endpoint data: {str(e)}",
+                details=str(e)
+            )
+    
+    def store_endpoints_bulk(self, items: List[EndpointData]) -> List[str]:
+        """
+        Store many endpoints in a single transaction.
+        
+        Args:
+            items: The endpoint data objects to store
+            
+        Returns:
+            The endpoint_ids, in input order
+            
+        Raises:
+            EndpointCreationError: If storage fails (no rows are stored)
+        """
+        # Serialize up front so the write transaction is held only for the inserts
+        try:
+            rows = [self._endpoint_to_row(item) for item in items]
+            payload_rows = [
+                (item.endpoint_id, serialization.dumps_bytes(item.json_data))
+                for item in items
+            ]
+        except (TypeError, ValueError) as e:
+            raise EndpointCreationError(
+                f"Failed to serialize endpoint data: {str(e)}",
+                details=str(e)
+            )
+        
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            with self._write_transaction(cursor):
+                cursor.executemany(self._SQL_INSERT, rows)
+                cursor.executemany(self._SQL_INSERT_PAYLOAD, payload_rows)
+            for item in items:
+                self._cache_invalidate(item.endpoint_id)
+            return [item.endpoint_id for item in items]
+            
+        except sqlite3.Error as e:
+            raise EndpointCreationError(
+                f"Failed to store endpoints: {str(e)}",
+                details=str(e)
+            )
     
     def get_endpoint(self, endpoint_id: str) -> Optional[EndpointData]:
         """
@@ -131,19 +579,125 @@ class DataStore:
         Returns:
             EndpointData if found, None otherwise
         """
-        conn = self._get_connection()
+        # Taken before the read, so a write in between invalidates the entry
+        token = self.change_token() if self.cache_size > 0 else None
+        cached = self._cache_get(endpoint_id, token)
+        if cached is not None:
+            return cached
+        
+        conn = self._get_read_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            'SELECT * FROM endpoints WHERE endpoint_id = ?',
-            (endpoint_id,)
-        )
+        cursor.execute(self._SQL_GET, (endpoint_id,))
         
         row = cursor.fetchone()
         if row is None:
             return None
         
-        return self._row_to_endpoint_data(row)
+        endpoint_data = self._row_to_endpoint_data(row)
+        self._cache_put(endpoint_id, token, bytes(row['json_data']), endpoint_data)
+        return endpoint_data
+    
+    def get_endpoint_bytes(
+        self,
+        endpoint_id: str,
+        include_metadata: bool = False
+    ) -> Optional[bytes]:
+        """
+        Retrieve an endpoint's JSON response body already encoded.
+        
+        The stored payload bytes are returned (or spliced into the metadata
+        envelope) as-is, without decoding and re-encoding json_data.
+        
+        Args:
+            endpoint_id: The endpoint ID to retrieve
+            include_metadata: Wrap the data in the same envelope as the
+                ?metadata=true API response
+            
+        Returns:
+            UTF-8 JSON bytes if found, None otherwise
+        """
+        conn = self._get_read_connection()
+        
+        if not include_metadata:
+            row = conn.execute(self._SQL_GET_PAYLOAD, (endpoint_id,)).fetchone()
+            return None if row is None else bytes(row[0])
+        
+        row = conn.execute(self._SQL_GET, (endpoint_id,)).fetchone()
+        if row is None:
+            return None
+        
+        return b''.join((
+            b'{"data":', bytes(row['json_data']),
+            b',"metadata":', serialization.dumps_bytes(self._row_to_metadata(row).to_dict()),
+            b',"endpoint_id":', serialization.dumps_bytes(endpoint_id),
+            b',"created_at":', serialization.dumps_bytes(_from_epoch_us(row['created_at'])),
+            b'}'
+        ))
+    
+    def get_endpoint_payload_size(self, endpoint_id: str) -> Optional[int]:
+        """
+        Return the size of an endpoint's stored JSON payload without reading it.
+        
+        Args:
+            endpoint_id: The endpoint ID to look up
+            
+        Returns:
+            Payload size in bytes if found, None otherwise
+        """
+        row = self._get_read_connection().execute(
+            self._SQL_GET_PAYLOAD_SIZE, (endpoint_id,)
+        ).fetchone()
+        return None if row is None else row[0]
+    
+    def iter_endpoint_payload(
+        self,
+        endpoint_id: str,
+        chunk_size: int = None
+    ) -> Optional[Iterator[bytes]]:
+        """
+        Stream an endpoint's stored JSON payload in chunks.
+        
+        Args:
+            endpoint_id: The endpoint ID to read
+            chunk_size: Bytes per chunk (default: BLOB_CHUNK_SIZE)
+            
+        Returns:
+            Iterator over the UTF-8 JSON bytes if found, None otherwise
+        """
+        chunk_size = chunk_size or self.BLOB_CHUNK_SIZE
+        
+        if self._share_write_connection or not HAS_BLOBOPEN:
+            row = self._get_read_connection().execute(
+                self._SQL_GET_PAYLOAD, (endpoint_id,)
+            ).fetchone()
+            return None if row is None else iter((bytes(row[0]),))
+        
+        # A dedicated connection keeps the open BLOB handle (and its read
+        # snapshot) away from the per-thread read connections
+        conn = self._connect()
+        row = conn.execute(self._SQL_GET_PAYLOAD_ROWID, (endpoint_id,)).fetchone()
+        if row is None:
+            conn.close()
+            return None
+        return self._iter_blob(conn, row[0], chunk_size)
+    
+    def get_endpoint_metadata_only(self, endpoint_id: str) -> Optional[EndpointInfo]:
+        """
+        Retrieve endpoint summary information without loading its payload.
+        
+        Args:
+            endpoint_id: The endpoint ID to retrieve
+            
+        Returns:
+            EndpointInfo if found (access_url left empty), None otherwise
+        """
+        conn = self._get_read_connection()
+        row = conn.execute(self._SQL_GET_INFO, (endpoint_id,)).fetchone()
+        if row is None:
+            return None
+        
+        return self._row_to_endpoint_info(row)
     
     def list_endpoints(self) -> List[EndpointInfo]:
         """
@@ -152,26 +706,29 @@ class DataStore:
         Returns:
             List of EndpointInfo objects
         """
-        conn = self._get_connection()
+        conn = self._get_read_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT endpoint_id, description, records_count, created_at
-            FROM endpoints
-            ORDER BY created_at DESC
-        ''')
+        cursor.execute(self._SQL_LIST)
+        
+        return [self._row_to_endpoint_info(row) for row in cursor.fetchall()]
+    
+    def list_endpoints_json(self, url_prefix: str = '') -> bytes:
+        """
+        List all stored endpoints as a JSON array built by SQLite.
         
-        endpoints = []
-        for row in cursor.fetchall():
-            endpoints.append(EndpointInfo(
-                endpoint_id=row['endpoint_id'],
-                access_url='',  # Will be set by EndpointManager
-                description=row['description'] or '',
-                created_at=datetime.fromisoformat(row['created_at']),
-                records_count=row['records_count'] or 0
-            ))
+        Skips creating EndpointInfo objects, for callers that only
+        forward the listing as JSON.
         
-        return endpoints
+        Args:
+            url_prefix: Prepended to each endpoint_id to form access_url
+            
+        Returns:
+            UTF-8 JSON array of EndpointInfo.to_dict()-shaped objects
+        """
+        conn = self._get_read_connection()
+        row = conn.execute(self._SQL_LIST_JSON, (url_prefix,)).fetchone()
+        return row[0].encode('utf-8')
     
     def delete_endpoint(self, endpoint_id: str) -> bool:
         """
@@ -186,36 +743,179 @@ class DataStore:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            'DELETE FROM endpoints WHERE endpoint_id = ?',
-            (endpoint_id,)
+        with self._write_transaction(cursor):
+            cursor.execute(self._SQL_DELETE_PAYLOAD, (endpoint_id,))
+            cursor.execute(self._SQL_DELETE, (endpoint_id,))
+            deleted = cursor.rowcount > 0
+        self._cache_invalidate(endpoint_id)
+        return deleted
+    
+    def change_token(self) -> Tuple[int, int]:
+        """
+        Return a value that changes whenever the stored data changes.
+        
+        Combines this store's own write counter with SQLite's data_version,
+        which also moves when another process commits to the same database
+        file, so caches derived from the data stay valid across processes.
+        data_version is only comparable between calls on one connection, so
+        it is always read from the shared write connection, whichever thread
+        asks.
+        
+        Returns:
+            Opaque token to compare for equality
+        """
+        with self._write_lock:
+            conn = self._get_connection()
+            return self.version, conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def clear_cache(self):
+        """Drop all cached endpoints."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _cache_get(self, endpoint_id: str, token: tuple) -> Optional[EndpointData]:
+        """
+        Return a copy of a cached endpoint if it is still valid.
+        
+        Entries expire after cache_ttl, and as soon as change_token() differs
+        from the one they were cached under (a write from any process).
+        """
+        with self._cache_lock:
+            entry = self._cache.get(endpoint_id)
+            if entry is None:
+                return None
+            expires_at, cached_token, payload, endpoint_data = entry
+            if time.monotonic() >= expires_at or cached_token != token:
+                del self._cache[endpoint_id]
+                return None
+            self._cache.move_to_end(endpoint_id)
+        
+        return self._copy_endpoint_data(endpoint_data, serialization.loads(payload))
+    
+    def _cache_put(
+        self,
+        endpoint_id: str,
+        token: tuple,
+        payload: bytes,
+        endpoint_data: EndpointData
+    ):
+        """Cache an endpoint, evicting the least recently used beyond cache_size."""
+        if self.cache_size <= 0:
+            return
+        # json_data is rebuilt from payload on every hit
+        endpoint_data = self._copy_endpoint_data(endpoint_data, None)
+        with self._cache_lock:
+            self._cache[endpoint_id] = (
+                time.monotonic() + self.cache_ttl, token, payload, endpoint_data
+            )
+            self._cache.move_to_end(endpoint_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    @staticmethod
+    def _copy_endpoint_data(endpoint_data: EndpointData, json_data) -> EndpointData:
+        """Copy an EndpointData with new json_data and its own metadata lists."""
+        metadata = endpoint_data.metadata
+        return EndpointData(
+            endpoint_id=endpoint_data.endpoint_id,
+            json_data=json_data,
+            metadata=dataclasses.replace(
+                metadata,
+                source_urls=list(metadata.source_urls),
+                fields=list(metadata.fields)
+            ),
+            created_at=endpoint_data.created_at
+        )
+    
+    def _cache_invalidate(self, endpoint_id: str):
+        """Remove an endpoint from the cache."""
+        with self._cache_lock:
+            self._cache.pop(endpoint_id, None)
+    
+    @staticmethod
+    def _endpoint_to_row(endpoint_data: EndpointData) -> tuple:
+        """Convert EndpointData metadata to an endpoints INSERT parameter tuple."""
+        return (
+            endpoint_data.endpoint_id,
+            endpoint_data.metadata.description,
+            serialization.dumps(endpoint_data.metadata.source_urls),
+            endpoint_data.metadata.records_count,
+            serialization.dumps(endpoint_data.metadata.fields),
+            _to_epoch_us(endpoint_data.metadata.parsing_timestamp),
+            _to_epoch_us(endpoint_data.created_at)
         )
+    
+    def _insert_payload(
+        self,
+        conn: sqlite3.Connection,
+        cursor: sqlite3.Cursor,
+        endpoint_id: str,
+        payload: bytes
+    ):
+        """Insert a payload row, writing large payloads in chunks."""
+        if not HAS_BLOBOPEN or len(payload) <= self.BLOB_STREAM_THRESHOLD:
+            cursor.execute(self._SQL_INSERT_PAYLOAD, (endpoint_id, payload))
+            return
         
-        conn.commit()
-        return cursor.rowcount > 0
+        cursor.execute(self._SQL_INSERT_PAYLOAD_ZEROBLOB, (endpoint_id, len(payload)))
+        view = memoryview(payload)
+        with conn.blobopen('endpoint_payloads', 'json_data', cursor.lastrowid) as blob:
+            for offset in range(0, len(view), self.BLOB_CHUNK_SIZE):
+                blob.write(view[offset:offset + self.BLOB_CHUNK_SIZE])
     
-    def _row_to_endpoint_data(self, row: sqlite3.Row) -> EndpointData:
-        """Convert database row to EndpointData object."""
-        metadata = EndpointMetadata(
+    @staticmethod
+    def _iter_blob(conn: sqlite3.Connection, rowid: int, chunk_size: int) -> Iterator[bytes]:
+        """Yield a payload BLOB in chunks, closing conn when done."""
+        try:
+            with conn.blobopen('endpoint_payloads', 'json_data', rowid, readonly=True) as blob:
+                while True:
+                    chunk = blob.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _row_to_endpoint_info(row: sqlite3.Row) -> EndpointInfo:
+        """Convert a summary row to EndpointInfo."""
+        return EndpointInfo(
+            endpoint_id=row['endpoint_id'],
+            access_url='',  # Will be set by EndpointManager
             description=row['description'] or '',
-            source_urls=json.loads(row['source_urls'] or '[]'),
+            created_at=_from_epoch_us(row['created_at']),
+            records_count=row['records_count'] or 0
+        )
+    
+    @staticmethod
+    def _row_to_metadata(row: sqlite3.Row) -> EndpointMetadata:
+        """Convert database row to EndpointMetadata object."""
+        return EndpointMetadata(
+            description=row['description'] or '',
+            source_urls=serialization.loads(row['source_urls'] or '[]'),
             records_count=row['records_count'] or 0,
-            fields=json.loads(row['fields'] or '[]'),
-            parsing_timestamp=datetime.fromisoformat(row['parsing_timestamp'])
+            fields=serialization.loads(row['fields'] or '[]'),
+            parsing_timestamp=_from_epoch_us(row['parsing_timestamp'])
         )
-        
+    
+    def _row_to_endpoint_data(self, row: sqlite3.Row) -> EndpointData:
+        """Convert database row to EndpointData object."""
         return EndpointData(
             endpoint_id=row['endpoint_id'],
-            json_data=json.loads(row['json_data']),
-            metadata=metadata,
-            created_at=datetime.fromisoformat(row['created_at'])
+            json_data=serialization.loads(row['json_data']),
+            metadata=self._row_to_metadata(row),
+            created_at=_from_epoch_us(row['created_at'])
         )
     
     def close(self):
-        """Close database connection."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Close all database connections opened by this store."""
+        with self._write_lock, self._read_lock:
+            for conn in self._read_connections.values():
+                conn.close()
+            self._read_connections.clear()
+            if self._connection:
+                self._connection.close()
+                self._connection = None
     
     @staticmethod
     def generate_endpoint_id(description: str = None) -> str:
@@ -226,36 +926,22 @@ class DataStore:
             description: Optional description to extract keywords from
             
         Returns:
-            Endpoint ID in format: keyword1-keyword2-uuid (e.g., 'ipo-data-a3f2')
+            Endpoint ID in format: keyword1-keyword2-suffix (e.g., 'ipo-data-a3f2')
         """
-        import re
-        
         if description:
-            # Extract meaningful keywords from description
-            # Remove common words and keep only alphanumeric
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                         'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-                         'this', 'that', 'these', 'those', 'what', 'which', 'who', 'when',
-                         'where', 'why', 'how', 'all', 'each', 'every', 'both', 'few', 'more',
-                         'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own',
-                         'same', 'so', 'than', 'too', 'very', 'can', 'will', 'just', 'should',
-                         'now', 'get', 'list', 'data', 'api', 'endpoint'}
-            
-            # Clean and tokenize
-            words = re.findall(r'\b[a-zA-Z]+\b', description.lower())
-            
-            # Filter meaningful words (length > 2, not stop words)
-            keywords = [w for w in words if len(w) > 2 and w not in stop_words]
-            
-            # Take first 2-3 keywords
-            selected_keywords = keywords[:3] if len(keywords) >= 3 else keywords[:2]
+            # Take the first 3 meaningful words (length > 2, not stop words),
+            # stopping the scan as soon as they are found
+            keywords = []
+            for match in _WORD_RE.finditer(description):
+                word = match.group().lower()
+                if len(word) > 2 and word not in _STOP_WORDS:
+                    keywords.append(word)
+                    if len(keywords) == 3:
+                        break
             
-            if selected_keywords:
-                # Create keyword prefix
-                keyword_prefix = '-'.join(selected_keywords)
-                # Add short unique suffix
-                unique_suffix = str(uuid.uuid4())[:4]
-                return f"{keyword_prefix}-{unique_suffix}"
+            if keywords:
+                # Create keyword prefix with a short unique suffix
+                return f"{'-'.join(keywords)}-{secrets.token_hex(2)}"
         
         # Fallback to UUID if no description or no keywords found
-        return str(uuid.uuid4())[:8]
+        return secrets.token_hex(4)
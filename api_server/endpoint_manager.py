@@ -5,8 +5,9 @@ This module provides the EndpointManager class that coordinates between
 the data store and API server for endpoint lifecycle management.
 """
 
+import logging
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from ai_layer.parsing_models import ParsedDataResponse
 from api_server.models import (
@@ -26,6 +27,8 @@ except ImportError:
     HAS_CONSOLE_LOGGER = False
     console_logger = None
 
+logger = logging.getLogger(__name__)
+
 
 class EndpointManager:
     """Manages creation and lifecycle of API endpoints."""
@@ -39,7 +42,7 @@ class EndpointManager:
             base_url: Base URL for generating access URLs
         """
         self.data_store = data_store
-        self.base_url = base_url.rstrip('/')
+        self.set_base_url(base_url)
     
     def create_endpoint(
         self,
@@ -63,21 +66,103 @@ class EndpointManager:
         if HAS_CONSOLE_LOGGER and console_logger:
             console_logger.log_endpoint_creation_start(description or "API Endpoint")
         
-        print(f"[EndpointManager] create_endpoint() called")
+        logger.debug("create_endpoint() called")
+        
+        endpoint_data = self._build_endpoint_data(parsed_response, description)
+        endpoint_id = endpoint_data.endpoint_id
+        metadata = endpoint_data.metadata
+        
+        # Store in database
+        if HAS_CONSOLE_LOGGER and console_logger:
+            console_logger.info("Storing endpoint in database...")
+        self.data_store.store_endpoint(endpoint_data)
+        logger.debug("Endpoint %s stored successfully", endpoint_id)
+        
+        # Return endpoint info
+        access_url = self.get_access_url(endpoint_id)
+        
+        result = EndpointInfo(
+            endpoint_id=endpoint_id,
+            access_url=access_url,
+            description=metadata.description,
+            created_at=endpoint_data.created_at,
+            records_count=metadata.records_count
+        )
+        
+        # Log success with colorful console
+        if HAS_CONSOLE_LOGGER and console_logger:
+            console_logger.log_endpoint_creation_complete(result)
+        
+        logger.debug("Endpoint created: %s", access_url)
+        return result
+    
+    def create_endpoints(
+        self,
+        items: List[Tuple[ParsedDataResponse, Optional[str]]]
+    ) -> List[EndpointInfo]:
+        """
+        Create several API endpoints, storing them in a single transaction.
         
+        Args:
+            items: (parsed_response, description) pairs, one per endpoint
+            
+        Returns:
+            EndpointInfo for each created endpoint, in input order
+            
+        Raises:
+            EndpointCreationError: If any item is invalid or storage fails
+                (no endpoints are created in that case)
+        """
+        endpoints = [
+            self._build_endpoint_data(parsed_response, description)
+            for parsed_response, description in items
+        ]
+        self.data_store.store_endpoints_bulk(endpoints)
+        
+        return [
+            EndpointInfo(
+                endpoint_id=endpoint.endpoint_id,
+                access_url=self.get_access_url(endpoint.endpoint_id),
+                description=endpoint.metadata.description,
+                created_at=endpoint.created_at,
+                records_count=endpoint.metadata.records_count
+            )
+            for endpoint in endpoints
+        ]
+    
+    def batch(self):
+        """
+        Commit all endpoint creations and deletions in the block at once.
+        
+        Returns:
+            Context manager from DataStore.batch()
+        """
+        return self.data_store.batch()
+    
+    def _build_endpoint_data(
+        self,
+        parsed_response: ParsedDataResponse,
+        description: Optional[str]
+    ) -> EndpointData:
+        """
+        Validate parsed data and build the EndpointData to store.
+        
+        Raises:
+            EndpointCreationError: If data is invalid
+        """
         # Validate input
         if parsed_response is None:
             error_msg = "ParsedDataResponse cannot be None"
             if HAS_CONSOLE_LOGGER and console_logger:
                 console_logger.error(error_msg)
-            print(f"[EndpointManager] ERROR: ParsedDataResponse is None")
+            logger.debug("ParsedDataResponse is None")
             raise EndpointCreationError(error_msg)
         
         if not parsed_response.data:
             error_msg = "ParsedDataResponse contains no data"
             if HAS_CONSOLE_LOGGER and console_logger:
                 console_logger.error(error_msg)
-            print(f"[EndpointManager] ERROR: ParsedDataResponse.data is empty")
+            logger.debug("ParsedDataResponse.data is empty")
             raise EndpointCreationError(
                 error_msg,
                 details="The data field is empty or None"
@@ -85,13 +170,12 @@ class EndpointManager:
         
         if HAS_CONSOLE_LOGGER and console_logger:
             console_logger.info(f"Validated input - data has {len(str(parsed_response.data))} chars")
-        print(f"[EndpointManager] Validated input - data has {len(str(parsed_response.data))} chars")
         
         # Generate unique endpoint ID with keywords from description
         endpoint_id = DataStore.generate_endpoint_id(description)
         if HAS_CONSOLE_LOGGER and console_logger:
             console_logger.key_value("Endpoint ID", endpoint_id)
-        print(f"[EndpointManager] Generated endpoint_id: {endpoint_id}")
+        logger.debug("Generated endpoint_id: %s", endpoint_id)
         
         # Extract metadata from parsed response
         metadata = EndpointMetadata(
@@ -103,7 +187,10 @@ class EndpointManager:
         )
         if HAS_CONSOLE_LOGGER and console_logger:
             console_logger.info(f"Created metadata: records={metadata.records_count}, fields={len(metadata.fields)}")
-        print(f"[EndpointManager] Created metadata: records={metadata.records_count}, fields={len(metadata.fields)}")
+        logger.debug(
+            "Created metadata: records=%d, fields=%d",
+            metadata.records_count, len(metadata.fields)
+        )
         
         # Create endpoint data
         endpoint_data = EndpointData(
@@ -113,30 +200,7 @@ class EndpointManager:
             created_at=datetime.utcnow()
         )
         
-        # Store in database
-        if HAS_CONSOLE_LOGGER and console_logger:
-            console_logger.info("Storing endpoint in database...")
-        print(f"[EndpointManager] Storing endpoint in database...")
-        self.data_store.store_endpoint(endpoint_data)
-        print(f"[EndpointManager] Endpoint stored successfully")
-        
-        # Return endpoint info
-        access_url = self.get_access_url(endpoint_id)
-        
-        result = EndpointInfo(
-            endpoint_id=endpoint_id,
-            access_url=access_url,
-            description=metadata.description,
-            created_at=endpoint_data.created_at,
-            records_count=metadata.records_count
-        )
-        
-        # Log success with colorful console
-        if HAS_CONSOLE_LOGGER and console_logger:
-            console_logger.log_endpoint_creation_complete(result)
-        
-        print(f"[EndpointManager] ✅ Endpoint created: {access_url}")
-        return result
+        return endpoint_data
     
     def get_endpoint(self, endpoint_id: str) -> Optional[EndpointData]:
         """
@@ -150,6 +214,21 @@ class EndpointManager:
         """
         return self.data_store.get_endpoint(endpoint_id)
     
+    def get_endpoint_info(self, endpoint_id: str) -> Optional[EndpointInfo]:
+        """
+        Get endpoint summary information without loading its JSON payload.
+        
+        Args:
+            endpoint_id: The endpoint ID
+            
+        Returns:
+            EndpointInfo with access URL populated if found, None otherwise
+        """
+        endpoint = self.data_store.get_endpoint_metadata_only(endpoint_id)
+        if endpoint is not None:
+            endpoint.access_url = self._url_prefix + endpoint.endpoint_id
+        return endpoint
+    
     def list_endpoints(self) -> List[EndpointInfo]:
         """
         List all available endpoints.
@@ -160,11 +239,21 @@ class EndpointManager:
         endpoints = self.data_store.list_endpoints()
         
         # Populate access URLs
+        prefix = self._url_prefix
         for endpoint in endpoints:
-            endpoint.access_url = self.get_access_url(endpoint.endpoint_id)
+            endpoint.access_url = prefix + endpoint.endpoint_id
         
         return endpoints
     
+    def list_endpoints_json(self) -> bytes:
+        """
+        List all available endpoints as pre-encoded JSON.
+        
+        Returns:
+            UTF-8 JSON array of endpoint dicts with access URLs populated
+        """
+        return self.data_store.list_endpoints_json(self._url_prefix)
+    
     def delete_endpoint(self, endpoint_id: str) -> bool:
         """
         Delete an endpoint by ID.
@@ -187,7 +276,7 @@ class EndpointManager:
         Returns:
             Full HTTP URL for accessing the endpoint
         """
-        return f"{self.base_url}/api/data/{endpoint_id}"
+        return self._url_prefix + endpoint_id
     
     def set_base_url(self, base_url: str):
         """
@@ -197,3 +286,5 @@ class EndpointManager:
             base_url: New base URL
         """
         self.base_url = base_url.rstrip('/')
+        # Precomputed so access URLs are a single concatenation
+        self._url_prefix = f"{self.base_url}/api/data/"
@@ -8,13 +8,21 @@ used throughout the API server.
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-import json
+
+from api_server import serialization
+
+
+# The models below declare __slots__ by hand rather than using
+# @dataclass(slots=True) so they keep working on Python < 3.10.
+# Fields must not have defaults for this to work.
 
 
 @dataclass
 class EndpointMetadata:
     """Metadata about the endpoint."""
     
+    __slots__ = ('description', 'source_urls', 'records_count', 'fields', 'parsing_timestamp')
+    
     description: str
     source_urls: List[str]
     records_count: int
@@ -53,6 +61,8 @@ class EndpointMetadata:
 class EndpointData:
     """Complete endpoint data including JSON payload."""
     
+    __slots__ = ('endpoint_id', 'json_data', 'metadata', 'created_at')
+    
     endpoint_id: str
     json_data: Dict[str, Any]
     metadata: EndpointMetadata
@@ -91,13 +101,16 @@ class EndpointData:
     
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict(), indent=indent, default=str)
+        # Encoded straight from the dataclass; the output matches to_dict()
+        return serialization.dumps(self, indent=indent)
 
 
 @dataclass
 class EndpointInfo:
     """Summary information about an endpoint (for listing)."""
     
+    __slots__ = ('endpoint_id', 'access_url', 'description', 'created_at', 'records_count')
+    
     endpoint_id: str
     access_url: str
     description: str
@@ -0,0 +1,89 @@
+"""
+JSON serialization helpers for the API Endpoint Server.
+
+This module wraps orjson for fast encoding and decoding of endpoint
+payloads, falling back to the standard library json module when orjson
+is not installed.
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode types JSON has no native form for.
+
+    Dataclasses and datetimes are encoded the way orjson encodes them
+    natively, so both backends produce the same document.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: nested values are handed back to the encoder
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def dumps_bytes(obj: Any, indent: int = None) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: The object to serialize
+        indent: Optional indentation level (orjson only supports 2)
+
+    Returns:
+        JSON document as bytes. Dataclasses are encoded as objects and
+        datetimes as ISO 8601; other unsupported types use str().
+    """
+    if HAS_ORJSON and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    # Match orjson's compact, non-ASCII-escaping output byte for byte
+    separators = (',', ':') if indent is None else None
+    return json.dumps(
+        obj, indent=indent, separators=separators, ensure_ascii=False, default=_default
+    ).encode('utf-8')
+
+
+def dumps(obj: Any, indent: int = None) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: The object to serialize
+        indent: Optional indentation level
+
+    Returns:
+        JSON document as a string
+    """
+    return dumps_bytes(obj, indent=indent).decode('utf-8')
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        The decoded Python object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+
+    return json.loads(data)
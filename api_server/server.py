@@ -5,51 +5,177 @@ This module provides the APIServer class that runs a FastAPI server
 to serve stored JSON data via RESTful HTTP endpoints.
 """
 
+import logging
+import os
+import sys
 import threading
 import socket
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Hashable
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from starlette.datastructures import State
+from starlette.middleware.gzip import GZipMiddleware
 
 from api_server.models import (
     EndpointNotFoundError,
     ServerStartError
 )
 from api_server.data_store import DataStore
+from api_server import serialization
 
+logger = logging.getLogger(__name__)
 
-# Global reference to data store (set by APIServer)
-_data_store: Optional[DataStore] = None
-_base_url: str = "http://127.0.0.1:8080"
+try:
+    import uvloop  # noqa: F401
+    HAS_UVLOOP = sys.platform != "win32"
+except ImportError:
+    HAS_UVLOOP = False
+
+try:
+    import httptools  # noqa: F401
+    HAS_HTTPTOOLS = True
+except ImportError:
+    HAS_HTTPTOOLS = False
+
+
+# Encoded response bodies are cached per request in app.state.response_cache
+# (key -> (expires_at, body), least recently used first) while the data store
+# is unchanged. The cache is bounded by total body size; bodies larger than
+# _RESPONSE_CACHE_MAX_BODY are served without being cached.
+_RESPONSE_CACHE_TTL = 60.0
+_LIST_CACHE_TTL = 5.0
+_RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_RESPONSE_CACHE_MAX_BODY = 1024 * 1024
+_DATA_CACHE_HEADERS = {"Cache-Control": f"public, max-age={int(_RESPONSE_CACHE_TTL)}"}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
+    if getattr(app.state, "data_store", None) is None:
+        raise RuntimeError("Data store not configured; call configure() before starting")
     yield
 
 
+def configure(data_store: DataStore, base_url: str):
+    """
+    Point the app at a data store and the base URL used in access URLs.
+    
+    Request handlers read these from app.state rather than module globals.
+    
+    Args:
+        data_store: DataStore instance for data access
+        base_url: Base URL of the server, e.g. http://127.0.0.1:8080
+    """
+    state = app.state
+    state.data_store = data_store
+    state.base_url = base_url
+    state.data_url_prefix = f"{base_url}/api/data/"
+    # Cached listings embed the base URL, so start with an empty cache
+    state.response_cache = OrderedDict()
+    state.response_cache_bytes = 0
+    state.response_cache_token = None
+
+
+def _json_response(content) -> Response:
+    """
+    Build a JSON response without FastAPI's jsonable_encoder pass.
+    
+    Args:
+        content: JSON-serializable content (datetimes are encoded as ISO 8601)
+        
+    Returns:
+        Response with the encoded body
+    """
+    return Response(serialization.dumps_bytes(content), media_type="application/json")
+
+
+def _get_cached_body(state: State, key: Hashable) -> Optional[bytes]:
+    """
+    Return a cached response body if it is still valid.
+    
+    The whole cache is dropped as soon as the data store (in this or
+    another process) has committed a write since the bodies were cached.
+    
+    Args:
+        state: The app state holding the data store and cache
+        key: Cache key for the request
+        
+    Returns:
+        The encoded body, or None on a miss
+    """
+    cache = state.response_cache
+    token = state.data_store.change_token()
+    if token != state.response_cache_token:
+        cache.clear()
+        state.response_cache_bytes = 0
+        state.response_cache_token = token
+        return None
+    
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    expires_at, body = entry
+    if time.monotonic() >= expires_at:
+        del cache[key]
+        state.response_cache_bytes -= len(body)
+        return None
+    cache.move_to_end(key)
+    return body
+
+
+def _cache_body(state: State, key: Hashable, body: bytes, ttl: float):
+    """
+    Cache an encoded response body for ttl seconds.
+    
+    Least recently used bodies are evicted once the cache holds more than
+    _RESPONSE_CACHE_MAX_BYTES; bodies over _RESPONSE_CACHE_MAX_BODY are
+    not cached.
+    """
+    if len(body) > _RESPONSE_CACHE_MAX_BODY:
+        return
+    cache = state.response_cache
+    old = cache.pop(key, None)
+    if old is not None:
+        state.response_cache_bytes -= len(old[1])
+    cache[key] = (time.monotonic() + ttl, body)
+    state.response_cache_bytes += len(body)
+    while state.response_cache_bytes > _RESPONSE_CACHE_MAX_BYTES:
+        _, (_, evicted) = cache.popitem(last=False)
+        state.response_cache_bytes -= len(evicted)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="API Endpoint Server",
     description="Serves parsed JSON data as HTTP endpoints",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if serialization.HAS_ORJSON else JSONResponse
 )
 
+# Scraped JSON is repetitive and compresses well; small bodies are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+_HEALTH_BODY = b'{"status":"healthy","service":"api-endpoint-server"}'
+_HEALTH_HEADERS = {"Cache-Control": "no-store"}
+
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "api-endpoint-server"}
+    return Response(_HEALTH_BODY, media_type="application/json", headers=_HEALTH_HEADERS)
 
 
 @app.get("/api/data/{endpoint_id}")
 async def get_endpoint_data(
+    request: Request,
     endpoint_id: str,
     metadata: bool = Query(False, description="Include parsing metadata in response")
 ):
@@ -63,63 +189,59 @@ async def get_endpoint_data(
     Returns:
         JSON data stored for the endpoint
     """
-    if _data_store is None:
-        raise HTTPException(status_code=500, detail="Data store not initialized")
+    state = request.app.state
+    cache_key = (endpoint_id, metadata)
+    body = _get_cached_body(state, cache_key)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=_DATA_CACHE_HEADERS)
+    
+    data_store = state.data_store
+    if not metadata:
+        size = data_store.get_endpoint_payload_size(endpoint_id)
+        if size is not None and size > data_store.BLOB_STREAM_THRESHOLD:
+            # Large payloads are streamed from the BLOB instead of being
+            # read into memory (and are too big for the response cache)
+            chunks = data_store.iter_endpoint_payload(endpoint_id)
+            if chunks is not None:
+                return StreamingResponse(
+                    chunks, media_type="application/json", headers=_DATA_CACHE_HEADERS
+                )
     
-    endpoint_data = _data_store.get_endpoint(endpoint_id)
+    # Stored payloads are already encoded JSON, so nothing is re-serialized
+    body = data_store.get_endpoint_bytes(endpoint_id, include_metadata=metadata)
     
-    if endpoint_data is None:
+    if body is None:
         raise HTTPException(
             status_code=404,
             detail={"error": "Endpoint not found", "endpoint_id": endpoint_id}
         )
     
-    if metadata:
-        return JSONResponse(
-            content={
-                "data": endpoint_data.json_data,
-                "metadata": endpoint_data.metadata.to_dict(),
-                "endpoint_id": endpoint_id,
-                "created_at": endpoint_data.created_at.isoformat()
-            },
-            media_type="application/json"
-        )
-    
-    return JSONResponse(
-        content=endpoint_data.json_data,
-        media_type="application/json"
-    )
+    _cache_body(state, cache_key, body, _RESPONSE_CACHE_TTL)
+    return Response(body, media_type="application/json", headers=_DATA_CACHE_HEADERS)
 
 
 @app.get("/api/endpoints")
-async def list_endpoints():
+async def list_endpoints(request: Request):
     """
     List all available endpoints.
     
     Returns:
         List of endpoint information including IDs and access URLs
     """
-    if _data_store is None:
-        raise HTTPException(status_code=500, detail="Data store not initialized")
-    
-    endpoints = _data_store.list_endpoints()
+    state = request.app.state
+    body = _get_cached_body(state, "endpoints")
+    if body is not None:
+        return Response(body, media_type="application/json")
     
-    # Build response with access URLs
-    result = []
-    for ep in endpoints:
-        result.append({
-            "endpoint_id": ep.endpoint_id,
-            "access_url": f"{_base_url}/api/data/{ep.endpoint_id}",
-            "description": ep.description,
-            "created_at": ep.created_at.isoformat(),
-            "records_count": ep.records_count
-        })
-    
-    return JSONResponse(content={"endpoints": result}, media_type="application/json")
+    # The per-endpoint objects (with access URLs) are assembled by SQLite
+    endpoints_json = state.data_store.list_endpoints_json(state.data_url_prefix)
+    body = b'{"endpoints":' + endpoints_json + b'}'
+    _cache_body(state, "endpoints", body, _LIST_CACHE_TTL)
+    return Response(body, media_type="application/json")
 
 
 @app.delete("/api/endpoints/{endpoint_id}")
-async def delete_endpoint(endpoint_id: str):
+async def delete_endpoint(request: Request, endpoint_id: str):
     """
     Delete an endpoint.
     
@@ -129,10 +251,7 @@ async def delete_endpoint(endpoint_id: str):
     Returns:
         Confirmation message
     """
-    if _data_store is None:
-        raise HTTPException(status_code=500, detail="Data store not initialized")
-    
-    deleted = _data_store.delete_endpoint(endpoint_id)
+    deleted = request.app.state.data_store.delete_endpoint(endpoint_id)
     
     if not deleted:
         raise HTTPException(
@@ -140,12 +259,29 @@ async def delete_endpoint(endpoint_id: str):
             detail={"error": "Endpoint not found", "endpoint_id": endpoint_id}
         )
     
-    return JSONResponse(
-        content={"message": "Endpoint deleted successfully", "endpoint_id": endpoint_id},
-        media_type="application/json"
+    return _json_response(
+        {"message": "Endpoint deleted successfully", "endpoint_id": endpoint_id}
     )
 
 
+# The OpenAPI schema never changes after the routes above are registered,
+# so it is encoded once on first request and kept in app.state.openapi_body
+async def openapi_json(request: Request) -> Response:
+    """Serve the pre-encoded OpenAPI schema (replaces FastAPI's default route)."""
+    state = request.app.state
+    body = getattr(state, "openapi_body", None)
+    if body is None:
+        body = state.openapi_body = serialization.dumps_bytes(request.app.openapi())
+    return Response(body, media_type="application/json")
+
+
+app.router.routes[:] = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != app.openapi_url
+]
+app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
+
+
 class APIServer:
     """FastAPI server wrapper for serving API endpoints."""
     
@@ -153,6 +289,15 @@ class APIServer:
     DEFAULT_PORT = 8080
     MAX_PORT_ATTEMPTS = 10
     
+    # Idle keep-alive connections are held open this long (uvicorn's default
+    # is 5 s) so clients polling the API reuse one connection. Each idle
+    # connection costs a socket and a little memory until it times out.
+    KEEP_ALIVE_TIMEOUT = 75
+    # Requests beyond this many concurrent connections get a 503
+    # instead of piling up in the event loop
+    CONCURRENCY_LIMIT = 1000
+    BACKLOG = 2048
+    
     def __init__(
         self,
         data_store: DataStore,
@@ -167,21 +312,19 @@ class APIServer:
             host: Host to bind to (default: 127.0.0.1)
             port: Port to bind to (default: 8080)
         """
-        global _data_store, _base_url
-        
         self.data_store = data_store
         self.host = host or self.DEFAULT_HOST
         self.port = port or self.DEFAULT_PORT
         self._server_thread: Optional[threading.Thread] = None
         self._server: Optional[uvicorn.Server] = None
+        self._socket: Optional[socket.socket] = None
         self._running = False
         self._started_successfully = False
         
         # Set global data store reference
-        _data_store = data_store
-        _base_url = f"http://{self.host}:{self.port}"
+        configure(data_store, self.get_base_url())
         
-        print(f"[APIServer] Initialized with host={self.host}, port={self.port}")
+        logger.debug("Initialized with host=%s, port=%s", self.host, self.port)
     
     def start(self) -> str:
         """
@@ -193,40 +336,47 @@ class APIServer:
         Raises:
             ServerStartError: If server fails to start
         """
-        print(f"[APIServer] start() called, _running={self._running}")
+        logger.debug("start() called, _running=%s", self._running)
         
         if self._running and self._started_successfully:
-            print(f"[APIServer] Server already running at {self.get_base_url()}")
+            logger.debug("Server already running at %s", self.get_base_url())
             return self.get_base_url()
         
-        # Find available port
-        print(f"[APIServer] Finding available port starting from {self.port}...")
-        actual_port = self._find_available_port()
-        self.port = actual_port
-        print(f"[APIServer] Using port {self.port}")
+        # Bind the listening socket ourselves and hand it to uvicorn, so the
+        # port cannot be taken between choosing it and serving on it
+        logger.debug("Binding listening socket starting from port %d", self.port)
+        self._socket = self._bind_socket()
+        self.port = self._socket.getsockname()[1]
+        logger.debug("Using port %d", self.port)
         
-        global _base_url
-        _base_url = f"http://{self.host}:{self.port}"
+        configure(self.data_store, self.get_base_url())
         
         # Configure uvicorn with keep-alive settings
         config = uvicorn.Config(
             app=app,
             host=self.host,
             port=self.port,
-            log_level="info",  # Changed to info for more visibility
-            access_log=True
+            loop="uvloop" if HAS_UVLOOP else "asyncio",
+            http="httptools" if HAS_HTTPTOOLS else "h11",
+            timeout_keep_alive=self.KEEP_ALIVE_TIMEOUT,
+            limit_concurrency=self.CONCURRENCY_LIMIT,
+            backlog=self.BACKLOG,
+            # Per-request access logging goes through the logging lock and a
+            # synchronous stderr write; opt in with UVICORN_ACCESS_LOG=1
+            log_level=os.environ.get("UVICORN_LOG_LEVEL", "warning"),
+            access_log=os.environ.get("UVICORN_ACCESS_LOG") == "1"
         )
         self._server = uvicorn.Server(config)
         
         # Start in background thread - daemon=False to keep it alive
-        print(f"[APIServer] Starting server thread...")
+        logger.debug("Starting server thread")
         self._server_thread = threading.Thread(
             target=self._run_server,
             daemon=True,  # Daemon so it stops when main app stops
             name="APIServerThread"
         )
         self._server_thread.start()
-        print(f"[APIServer] Server thread started (thread id: {self._server_thread.ident})")
+        logger.debug("Server thread started (thread id: %s)", self._server_thread.ident)
         
         # Wait for server to start
         self._wait_for_startup()
@@ -234,88 +384,97 @@ class APIServer:
         self._running = True
         self._started_successfully = True
         
-        print(f"🚀 API Server started at {self.get_base_url()}")
-        print(f"📚 API docs available at {self.get_base_url()}/docs")
-        print(f"[APIServer] Server is now accepting connections")
+        if logger.isEnabledFor(logging.INFO):
+            base_url = self.get_base_url()
+            logger.info("API Server started at %s (docs at %s/docs)", base_url, base_url)
         
         return self.get_base_url()
     
     def _run_server(self):
         """Run the uvicorn server (called in background thread)."""
-        print(f"[APIServer] _run_server() starting in thread {threading.current_thread().name}")
+        logger.debug("_run_server() starting in thread %s", threading.current_thread().name)
         try:
-            self._server.run()
-            print(f"[APIServer] _run_server() completed normally")
+            self._server.run(sockets=[self._socket])
+            logger.debug("_run_server() completed normally")
         except Exception as e:
-            print(f"[APIServer] _run_server() ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("_run_server() error: %s", e)
         finally:
-            print(f"[APIServer] _run_server() exiting")
+            logger.debug("_run_server() exiting")
     
-    def _find_available_port(self) -> int:
-        """Find an available port starting from configured port."""
+    def _bind_socket(self) -> socket.socket:
+        """
+        Bind a listening socket on the first free port from the configured one.
+        
+        Returns:
+            The bound, listening socket
+            
+        Raises:
+            ServerStartError: If none of the MAX_PORT_ATTEMPTS ports could be bound
+        """
         for offset in range(self.MAX_PORT_ATTEMPTS):
             port = self.port + offset
-            if self._is_port_available(port):
-                return port
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            if sys.platform != "win32":
+                # Allow rebinding while old connections sit in TIME_WAIT
+                # (on Windows this option would allow stealing a bound port)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind((self.host, port))
+                sock.listen(self.BACKLOG)
+            except OSError:
+                sock.close()
+                continue
+            return sock
         
         raise ServerStartError(
-            f"Could not find available port after {self.MAX_PORT_ATTEMPTS} attempts",
+            f"Could not bind a port after {self.MAX_PORT_ATTEMPTS} attempts",
             port=self.port
         )
     
-    def _is_port_available(self, port: int) -> bool:
-        """Check if a port is available."""
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            try:
-                s.bind((self.host, port))
-                return True
-            except OSError:
-                return False
-    
     def _wait_for_startup(self, timeout: float = 10.0):
-        """Wait for server to be ready."""
-        import requests
+        """
+        Wait until uvicorn has finished its startup (including lifespan).
         
-        start_time = time.time()
-        health_url = f"http://{self.host}:{self.port}/health"
+        The listening socket is bound before the server thread starts, so a
+        TCP connect would succeed even if uvicorn then fails to start;
+        uvicorn.Server.started is only set once it is actually serving.
         
-        while time.time() - start_time < timeout:
-            # Check if server thread is alive
-            if self._server_thread and not self._server_thread.is_alive():
-                # Thread died, server failed to start
-                time.sleep(0.5)  # Give it a moment
-                if not self._server_thread.is_alive():
-                    print("⚠️ Server thread died during startup")
-                    break
-            
-            # Try to connect to health endpoint
-            try:
-                response = requests.get(health_url, timeout=1)
-                if response.status_code == 200:
-                    print(f"✓ Server health check passed")
-                    return
-            except requests.exceptions.ConnectionError:
-                pass  # Server not ready yet
-            except Exception as e:
-                print(f"Health check error: {e}")
-            
-            time.sleep(0.2)
+        Raises:
+            ServerStartError: If the server thread exits or startup times out
+        """
+        deadline = time.time() + timeout
         
-        # If we get here, server might still be starting - mark as running anyway
-        print("⚠️ Server startup timeout - proceeding anyway")
+        while not self._server.started:
+            if not self._server_thread.is_alive():
+                self._close_socket()
+                raise ServerStartError("Server thread exited during startup", port=self.port)
+            if time.time() >= deadline:
+                self._server.should_exit = True
+                self._server_thread.join(timeout=5)
+                self._close_socket()
+                raise ServerStartError(
+                    f"Server did not start within {timeout:.0f}s", port=self.port
+                )
+            time.sleep(0.02)
+        
+        logger.debug("Server is accepting connections")
+    
+    def _close_socket(self):
+        """Close the listening socket after a failed start."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
     
     def stop(self):
         """Stop the server gracefully."""
-        print(f"[APIServer] stop() called")
+        logger.debug("stop() called")
         if self._server and self._running:
             self._server.should_exit = True
             self._running = False
             self._started_successfully = False
-            print("🛑 API Server stopped")
+            logger.info("API Server stopped")
         else:
-            print(f"[APIServer] Server was not running (running={self._running})")
+            logger.debug("Server was not running (running=%s)", self._running)
     
     def is_running(self) -> bool:
         """Check if server is currently running."""
@@ -323,7 +482,7 @@ class APIServer:
         thread_alive = self._server_thread is not None and self._server_thread.is_alive()
         
         if self._running and not thread_alive:
-            print(f"[APIServer] WARNING: _running=True but thread is dead!")
+            logger.warning("Server marked running but its thread is dead")
             self._running = False
             self._started_successfully = False
         
@@ -0,0 +1,385 @@
+"""
+Tests for the SQLite-backed DataStore.
+
+Run:
+    python -m pytest api_server/test/test_data_store.py -v
+"""
+
+import json
+import multiprocessing
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add project root to path so we can import api_server
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api_server import serialization
+from api_server.data_store import DataStore, HAS_BLOBOPEN
+from api_server.models import EndpointData, EndpointMetadata, EndpointCreationError
+
+
+def make_endpoint(endpoint_id: str, records: int = 2) -> EndpointData:
+    """Build a small EndpointData for tests."""
+    return EndpointData(
+        endpoint_id=endpoint_id,
+        json_data={"data": [{"id": i, "name": f"item-{i}"} for i in range(records)]},
+        metadata=EndpointMetadata(
+            description=f"Test endpoint {endpoint_id}",
+            source_urls=["https://example.org/data"],
+            records_count=records,
+            fields=["id", "name"],
+            parsing_timestamp=datetime(2026, 1, 15, 12, 0, 0, 123456)
+        ),
+        created_at=datetime(2026, 1, 15, 12, 5, 0, 654321)
+    )
+
+
+@pytest.fixture
+def data_store(tmp_path):
+    """DataStore backed by a temporary database file."""
+    store = DataStore(str(tmp_path / "endpoints.db"), fast_mode=False)
+    yield store
+    store.close()
+
+
+def test_store_and_get_endpoint_round_trip(data_store):
+    """Stored endpoints are returned unchanged."""
+    endpoint = make_endpoint("round-trip-0001")
+    data_store.store_endpoint(endpoint)
+
+    assert data_store.get_endpoint("round-trip-0001") == endpoint
+    assert data_store.get_endpoint("missing") is None
+
+
+def test_get_endpoint_metadata_only(data_store):
+    """Summary lookups return EndpointInfo without the payload."""
+    endpoint = make_endpoint("info-0001", records=3)
+    data_store.store_endpoint(endpoint)
+
+    info = data_store.get_endpoint_metadata_only("info-0001")
+
+    assert info.endpoint_id == "info-0001"
+    assert info.records_count == 3
+    assert info.created_at == endpoint.created_at
+    assert data_store.get_endpoint_metadata_only("missing") is None
+
+
+def test_delete_endpoint_removes_payload(data_store):
+    """Deleting an endpoint removes both its metadata and payload rows."""
+    data_store.store_endpoint(make_endpoint("delete-0001"))
+
+    assert data_store.delete_endpoint("delete-0001") is True
+    assert data_store.delete_endpoint("delete-0001") is False
+    assert data_store.get_endpoint("delete-0001") is None
+    payloads = data_store._get_connection().execute(
+        'SELECT COUNT(*) FROM endpoint_payloads'
+    ).fetchone()[0]
+    assert payloads == 0
+
+
+def test_get_endpoint_bytes(data_store):
+    """Encoded bodies match the data and metadata envelope of the API."""
+    endpoint = make_endpoint("bytes-0001")
+    data_store.store_endpoint(endpoint)
+
+    assert json.loads(data_store.get_endpoint_bytes("bytes-0001")) == endpoint.json_data
+    assert json.loads(data_store.get_endpoint_bytes("bytes-0001", include_metadata=True)) == {
+        "data": endpoint.json_data,
+        "metadata": endpoint.metadata.to_dict(),
+        "endpoint_id": "bytes-0001",
+        "created_at": endpoint.created_at.isoformat()
+    }
+    assert data_store.get_endpoint_bytes("missing") is None
+
+
+def test_large_payload_is_written_and_read_in_chunks(data_store):
+    """Payloads above the threshold round-trip through incremental BLOB I/O."""
+    data_store.BLOB_STREAM_THRESHOLD = 256
+    data_store.BLOB_CHUNK_SIZE = 100
+    endpoint = make_endpoint("large-0001", records=50)
+    data_store.store_endpoint(endpoint)
+
+    data_store.clear_cache()
+    assert data_store.get_endpoint("large-0001") == endpoint
+
+    chunks = list(data_store.iter_endpoint_payload("large-0001"))
+    assert json.loads(b"".join(chunks)) == endpoint.json_data
+    assert data_store.get_endpoint_payload_size("large-0001") == len(b"".join(chunks))
+    assert data_store.get_endpoint_payload_size("missing") is None
+    assert len(chunks) > 1 or not HAS_BLOBOPEN
+    assert data_store.iter_endpoint_payload("missing") is None
+
+
+def test_get_endpoint_uses_lru_cache(tmp_path):
+    """Repeat reads are served from the cache, which evicts beyond cache_size."""
+    store = DataStore(str(tmp_path / "endpoints.db"), fast_mode=False, cache_size=2)
+    try:
+        for i in range(3):
+            store.store_endpoint(make_endpoint(f"cache-{i:04d}"))
+
+        first = store.get_endpoint("cache-0000")
+        assert "cache-0000" in store._cache
+        cached = store.get_endpoint("cache-0000")
+        assert cached == first
+
+        # Hits are copies, so mutating one does not leak into later reads
+        cached.json_data["data"].clear()
+        cached.metadata.fields.append("extra")
+        assert store.get_endpoint("cache-0000") == first
+
+        store.get_endpoint("cache-0001")
+        store.get_endpoint("cache-0002")
+        assert list(store._cache) == ["cache-0001", "cache-0002"]
+
+        store.delete_endpoint("cache-0001")
+        assert "cache-0001" not in store._cache
+
+        store.clear_cache()
+        assert "cache-0000" not in store._cache
+    finally:
+        store.close()
+
+
+def test_cache_is_invalidated_by_other_connections(tmp_path):
+    """A write from another DataStore on the same file invalidates cached reads."""
+    path = str(tmp_path / "endpoints.db")
+    reader = DataStore(path, fast_mode=False)
+    writer = DataStore(path, fast_mode=False)
+    try:
+        reader.store_endpoint(make_endpoint("shared-0001"))
+        assert reader.get_endpoint("shared-0001") is not None
+
+        writer.delete_endpoint("shared-0001")
+        assert reader.get_endpoint("shared-0001") is None
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_list_endpoints_json_matches_endpoint_info(data_store):
+    """The SQLite-built listing matches EndpointInfo.to_dict() output."""
+    first = make_endpoint("json-0001")
+    second = make_endpoint("json-0002")
+    second.created_at = datetime(2026, 2, 1, 8, 30)
+    data_store.store_endpoints_bulk([first, second])
+
+    prefix = "http://127.0.0.1:8080/api/data/"
+    expected = []
+    for info in data_store.list_endpoints():
+        info.access_url = prefix + info.endpoint_id
+        expected.append(info.to_dict())
+
+    assert json.loads(data_store.list_endpoints_json(prefix)) == expected
+
+
+def test_list_endpoints_uses_covering_index(data_store):
+    """Listing is satisfied from idx_list_cover without touching the table."""
+    plan = data_store._get_connection().execute(
+        'EXPLAIN QUERY PLAN ' + DataStore._SQL_LIST
+    ).fetchall()
+
+    assert any('COVERING INDEX idx_list_cover' in row['detail'] for row in plan)
+
+
+def test_store_endpoints_bulk(data_store):
+    """Bulk storage writes every endpoint."""
+    endpoints = [make_endpoint(f"bulk-{i:04d}", records=i + 1) for i in range(5)]
+
+    ids = data_store.store_endpoints_bulk(endpoints)
+
+    assert ids == [endpoint.endpoint_id for endpoint in endpoints]
+    assert len(data_store.list_endpoints()) == 5
+    assert data_store.get_endpoint("bulk-0003") == endpoints[3]
+
+
+def test_store_endpoints_bulk_is_atomic(data_store):
+    """A failing row rolls back the whole batch."""
+    data_store.store_endpoint(make_endpoint("bulk-0002"))
+    endpoints = [make_endpoint(f"bulk-{i:04d}") for i in range(5)]
+
+    with pytest.raises(EndpointCreationError):
+        data_store.store_endpoints_bulk(endpoints)
+
+    assert [ep.endpoint_id for ep in data_store.list_endpoints()] == ["bulk-0002"]
+
+
+def test_unserializable_payload_raises_creation_error(data_store):
+    """Serialization failures surface as EndpointCreationError and store nothing."""
+    circular = []
+    circular.append(circular)
+    endpoint = make_endpoint("bad-0001")
+    endpoint.json_data = {"data": circular}
+
+    with pytest.raises(EndpointCreationError):
+        data_store.store_endpoint(endpoint)
+    with pytest.raises(EndpointCreationError):
+        data_store.store_endpoints_bulk([make_endpoint("bad-0002"), endpoint])
+
+    assert data_store.list_endpoints() == []
+
+
+def test_fallback_encoder_matches_orjson(monkeypatch):
+    """The json fallback encodes nested datetimes exactly like orjson."""
+    value = {
+        "data": [
+            {"seen": datetime(2026, 1, 15, 12, 0, 0, 123456), "day": date(2026, 1, 15)},
+            {"seen": datetime(2026, 1, 15, 12, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))},
+        ],
+        "nested": {"times": (datetime(2026, 1, 15), datetime(2026, 1, 15, tzinfo=timezone.utc))},
+        "name": "caf\u00e9",
+    }
+    expected = (
+        '{"data":[{"seen":"2026-01-15T12:00:00.123456","day":"2026-01-15"},'
+        '{"seen":"2026-01-15T12:00:00+05:30"}],'
+        '"nested":{"times":["2026-01-15T00:00:00","2026-01-15T00:00:00+00:00"]},'
+        '"name":"caf\u00e9"}'
+    ).encode("utf-8")
+
+    if serialization.HAS_ORJSON:
+        assert serialization.dumps_bytes(value) == expected
+    monkeypatch.setattr(serialization, "HAS_ORJSON", False)
+    assert serialization.dumps_bytes(value) == expected
+
+
+def test_batch_commits_once_and_rolls_back_on_error(data_store):
+    """Writes inside batch() are committed together or not at all."""
+    with data_store.batch():
+        data_store.store_endpoint(make_endpoint("batch-0001"))
+        data_store.store_endpoint(make_endpoint("batch-0002"))
+    assert len(data_store.list_endpoints()) == 2
+
+    with pytest.raises(RuntimeError):
+        with data_store.batch():
+            data_store.delete_endpoint("batch-0001")
+            data_store.store_endpoint(make_endpoint("batch-0003"))
+            raise RuntimeError("abort")
+
+    ids = sorted(ep.endpoint_id for ep in data_store.list_endpoints())
+    assert ids == ["batch-0001", "batch-0002"]
+
+
+def create_legacy_database(db_path: str, endpoint: EndpointData):
+    """Write a database in the original TEXT schema holding one endpoint."""
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE endpoints (
+            endpoint_id TEXT PRIMARY KEY,
+            json_data TEXT NOT NULL,
+            description TEXT,
+            source_urls TEXT,
+            records_count INTEGER,
+            fields TEXT,
+            parsing_timestamp TEXT,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    conn.execute(
+        'INSERT INTO endpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            endpoint.endpoint_id,
+            json.dumps(endpoint.json_data),
+            endpoint.metadata.description,
+            json.dumps(endpoint.metadata.source_urls),
+            endpoint.metadata.records_count,
+            json.dumps(endpoint.metadata.fields),
+            endpoint.metadata.parsing_timestamp.isoformat(),
+            endpoint.created_at.isoformat()
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_legacy_text_schema(tmp_path):
+    """Databases created with the original TEXT schema are migrated on open."""
+    db_path = str(tmp_path / "legacy.db")
+    endpoint = make_endpoint("legacy-0001")
+    create_legacy_database(db_path, endpoint)
+
+    store = DataStore(db_path, fast_mode=False)
+    try:
+        assert store.get_endpoint("legacy-0001") == endpoint
+        created_at = store._get_connection().execute(
+            'SELECT created_at FROM endpoints'
+        ).fetchone()[0]
+        assert created_at == 1768478700654321
+        version = store._get_connection().execute('PRAGMA user_version').fetchone()[0]
+        assert version == DataStore.SCHEMA_VERSION
+    finally:
+        store.close()
+
+
+def test_cache_is_invalidated_across_threads(tmp_path):
+    """An entry cached by one thread is invalidated for reads from other threads."""
+    path = str(tmp_path / "endpoints.db")
+    reader = DataStore(path, fast_mode=False)
+    writer = DataStore(path, fast_mode=False)
+    try:
+        reader.store_endpoint(make_endpoint("shared-0001"))
+        assert reader.get_endpoint("shared-0001") is not None
+        writer.delete_endpoint("shared-0001")
+
+        # A new thread gets a new read connection with its own data_version
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(reader.get_endpoint("shared-0001"))
+        )
+        thread.start()
+        thread.join()
+        assert result == [None]
+    finally:
+        reader.close()
+        writer.close()
+
+
+def _open_store_after_barrier(db_path: str, barrier):
+    """Process target: open (and close) a DataStore once all peers are ready."""
+    barrier.wait()
+    DataStore(db_path).close()
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="needs the fork start method"
+)
+@pytest.mark.parametrize("legacy", [False, True], ids=["new", "legacy"])
+def test_concurrent_processes_initialize_schema_once(tmp_path, legacy):
+    """Processes opening the same new or legacy database at once all succeed."""
+    db_path = str(tmp_path / "shared.db")
+    endpoint = make_endpoint("legacy-0001")
+    if legacy:
+        create_legacy_database(db_path, endpoint)
+
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(8)
+    processes = [
+        ctx.Process(target=_open_store_after_barrier, args=(db_path, barrier))
+        for _ in range(8)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+    assert [process.exitcode for process in processes] == [0] * 8
+
+    store = DataStore(db_path)
+    try:
+        version = store._get_connection().execute('PRAGMA user_version').fetchone()[0]
+        assert version == DataStore.SCHEMA_VERSION
+        assert store.get_endpoint("legacy-0001") == (endpoint if legacy else None)
+    finally:
+        store.close()
+
+
+def test_generate_endpoint_id_uses_description_keywords():
+    """IDs are built from description keywords, falling back to a random hex ID."""
+    endpoint_id = DataStore.generate_endpoint_id("Get the latest IPO listings from NSE")
+
+    assert endpoint_id.startswith("latest-ipo-listings-")
+    assert len(endpoint_id.rsplit("-", 1)[1]) == 4
+    assert len(DataStore.generate_endpoint_id()) == 8
@@ -1,4 +1,5 @@
 import streamlit as st
+import pandas as pd
 from utils.ui_components import render_header
 from utils.styles import load_custom_css
 from components.form import render_api_form
@@ -7,6 +8,7 @@ from components.input_help import render_input_format_guide, show_validation_sum
 
 # Console Logger for colorful output
 from utils.console_logger import logger as console_logger
+from utils.script_urls import iter_script_urls
 
 # AI Layer imports
 from ai_layer import (
@@ -42,56 +44,19 @@ from api_server import (
     EndpointCreationError
 )
 
-import re
+import atexit
+import hashlib
+import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cached_property
 
-def _extract_url_from_script(script_code: str) -> str:
-    """
-    Extract a suggested URL from the generated script's DEFAULT_URLS list or comments.
-    
-    AI-generated scripts should include a DEFAULT_URLS list at the top like:
-    DEFAULT_URLS = ['https://example.com/data', 'https://other.com/info']
-    
-    Returns:
-        First valid URL found, or empty string if none found
-    """
-    # Pattern to match DEFAULT_URLS list - highest priority
-    default_urls_pattern = r'DEFAULT_URLS\s*=\s*\[(.*?)\]'
-    match = re.search(default_urls_pattern, script_code, re.DOTALL)
-    if match:
-        urls_content = match.group(1)
-        # Extract URLs from the list
-        url_matches = re.findall(r'[\'\"](https?://[^\s\'\"\,]+)[\'\"]\s*,?', urls_content)
-        for url in url_matches:
-            url = url.strip().rstrip('.,;:\'\"')
-            # Skip placeholder/example URLs
-            if 'example.com' not in url and 'example-' not in url and url.startswith('http'):
-                return url
-    
-    # Fallback patterns for URLs in comments or assignments
-    url_patterns = [
-        # Match URLs in comments with dash prefix (common format)
-        r'#\s*-?\s*(https?://[^\s<>]+)',
-        # Match test_url or example_url assignments
-        r'(?:test_url|example_url|url)\s*=\s*[\'"](https?://[^\s<>]+)[\'"]',
-        # Match any URL in quotes
-        r'[\'"](https?://[^\s<>]+)[\'"]',
-    ]
-    
-    for pattern in url_patterns:
-        matches = re.findall(pattern, script_code, re.IGNORECASE)
-        for match in matches:
-            url = match.strip().rstrip('.,;:\'\"')
-            # Skip example.com and sites that require auth
-            skip_domains = ['example.com', 'example-', 'goodreads.com', 'amazon.com']
-            if any(domain in url for domain in skip_domains):
-                continue
-            if url.startswith('http'):
-                return url
-    
-    return ''
-
+logger = logging.getLogger(__name__)
 
+# Streamlit re-executes this module on every rerun, which would discard an
+# functools.lru_cache; st.cache_data persists across reruns and sessions
+@st.cache_data(max_entries=32, show_spinner=False)
 def _extract_all_urls_from_script(script_code: str) -> list:
     """
     Extract all URLs from the generated script's DEFAULT_URLS list.
@@ -99,22 +64,7 @@ def _extract_all_urls_from_script(script_code: str) -> list:
     Returns:
         List of valid URLs found
     """
-    urls = []
-    
-    # Pattern to match DEFAULT_URLS list
-    default_urls_pattern = r'DEFAULT_URLS\s*=\s*\[(.*?)\]'
-    match = re.search(default_urls_pattern, script_code, re.DOTALL)
-    if match:
-        urls_content = match.group(1)
-        # Extract URLs from the list
-        url_matches = re.findall(r'[\'\"](https?://[^\s\'\"\,]+)[\'\"]\s*,?', urls_content)
-        for url in url_matches:
-            url = url.strip().rstrip('.,;:\'\"')
-            # Skip placeholder/example URLs
-            if 'example.com' not in url and 'example-' not in url and url.startswith('http'):
-                urls.append(url)
-    
-    return urls
+    return list(iter_script_urls(script_code))
 
 # Page configuration
 st.set_page_config(
@@ -126,52 +76,162 @@ st.set_page_config(
 # Load custom CSS
 load_custom_css()
 
+class AIComponents:
+    """
+    AI layer objects sharing one DeepSeek client.
+    
+    Generators, executor and parser are built on first use, so a session
+    that only uses one scraping mode never constructs the other generator.
+    """
+    
+    def __init__(self, client: DeepSeekClient, scraping_config: ScrapingConfig):
+        self.client = client
+        self.scraping_config = scraping_config
+    
+    @cached_property
+    def standard_script_generator(self) -> ScraperScriptGenerator:
+        """Standard (traditional) script generator."""
+        return ScraperScriptGenerator(
+            self.client, self.scraping_config,
+            ScriptPromptBuilder(self.scraping_config), ScriptValidator()
+        )
+    
+    @cached_property
+    def light_script_generator(self) -> ScraperScriptGenerator:
+        """Light script generator (HTML + AI extraction)."""
+        return ScraperScriptGenerator(
+            self.client, self.scraping_config,
+            HTMLExtractorPromptBuilder(self.scraping_config), LightScriptValidator()
+        )
+    
+    @cached_property
+    def executor(self) -> DynamicScriptExecutor:
+        """Dynamic executor for running generated scripts."""
+        # Scripts run with fresh sandbox globals per call, so multiple
+        # source URLs can be scraped concurrently
+        execution_config = ExecutionConfig(timeout_seconds=60, max_parallel_sources=8)
+        return DynamicScriptExecutor(execution_config)
+    
+    @cached_property
+    def formatter(self) -> ConsoleOutputFormatter:
+        """Console formatter for execution results."""
+        return ConsoleOutputFormatter(use_colors=False, max_records_display=20)
+    
+    @cached_property
+    def data_parser(self) -> ScrapedDataParser:
+        """Parser turning scraped records into structured JSON."""
+        return ScrapedDataParser(self.client)
+
+
 # Initialize AI Layer (with error handling for missing API key)
-@st.cache_resource
 def initialize_ai_components():
-    """Initialize the Script Generator and Data Parser with configuration."""
+    """Load the AI configuration and client; other components are built lazily."""
     try:
         deepseek_config = DeepSeekConfig.from_env()
         scraping_config = ScrapingConfig.from_env()
         
+        # One client (and keep-alive session) shared by script generation
+        # and data parsing, closed when the process exits
         client = DeepSeekClient(deepseek_config.api_key, deepseek_config.base_url)
+        atexit.register(client.close)
         
-        # Initialize standard (traditional) script generator
-        standard_prompt_builder = ScriptPromptBuilder(scraping_config)
-        standard_validator = ScriptValidator()
-        standard_script_generator = ScraperScriptGenerator(
-            client, scraping_config, standard_prompt_builder, standard_validator
-        )
-        
-        # Initialize light script generator
-        light_prompt_builder = HTMLExtractorPromptBuilder(scraping_config)
-        light_validator = LightScriptValidator()
-        light_script_generator = ScraperScriptGenerator(
-            client, scraping_config, light_prompt_builder, light_validator
-        )
-        
-        # Initialize the dynamic executor for running generated scripts
-        execution_config = ExecutionConfig(timeout_seconds=60)
-        executor = DynamicScriptExecutor(execution_config)
-        formatter = ConsoleOutputFormatter(use_colors=False, max_records_display=20)
-        
-        # Initialize the scraped data parser
-        data_parser = ScrapedDataParser(client)
-        
-        return standard_script_generator, light_script_generator, executor, formatter, data_parser, None
+        return AIComponents(client, scraping_config), None
     except ConfigurationError as e:
-        return None, None, None, None, None, e
+        return None, e
+
+class InvalidScriptResult(Exception):
+    """Carries an invalid GeneratedScript out of the cache without storing it."""
+
+    def __init__(self, generated_script):
+        super().__init__("Generated script failed validation")
+        self.generated_script = generated_script
+
+
+# Script generation is an LLM call; identical resubmissions reuse the result.
+# st.cache_data does not store raised exceptions, so invalid scripts are
+# raised out of it and regenerated on the next submit.
+@st.cache_data(ttl=3600, show_spinner=False)
+def generate_script_cached(
+    use_light_scraping: bool,
+    data_description: str,
+    data_source: str,
+    desired_fields: str,
+    response_structure: str,
+    update_frequency: str
+):
+    """
+    Generate a scraper script, cached on the form fields that affect it.
+
+    Raises:
+        InvalidScriptResult: If the generated script failed validation
+    """
+    if use_light_scraping:
+        script_generator = ai_components.light_script_generator
+    else:
+        script_generator = ai_components.standard_script_generator
+    generated_script = script_generator.generate_script({
+        'data_description': data_description,
+        'data_source': data_source,
+        'desired_fields': desired_fields,
+        'response_structure': response_structure,
+        'update_frequency': update_frequency
+    })
+    if not generated_script.is_valid:
+        raise InvalidScriptResult(generated_script)
+    return generated_script
+
+# Parsing is an LLM call; re-parsing the same scraped records with the same
+# requirements reuses the earlier response. ExecutionResult carries fresh
+# timestamps on every run, so it is keyed by a digest of its records and
+# source URLs instead of being hashed itself.
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def parse_scraped_data_cached(_execution_result, data_key: str, user_requirements: dict):
+    """Parse scraped data, cached on the records digest and the requirements."""
+    return ai_components.data_parser.parse_scraped_data(
+        scraping_result=_execution_result,
+        user_requirements=user_requirements
+    )
+
+
+def scraped_data_key(execution_result) -> str:
+    """Digest of the scraped records and their source URLs."""
+    source_urls = [sr.source_url for sr in execution_result.source_results]
+    payload = json.dumps([source_urls, execution_result.data], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
 
-standard_script_generator, light_script_generator, executor, formatter, data_parser, config_error = initialize_ai_components()
+
+def parse_scraped_data(execution_result, user_requirements: dict):
+    """
+    Parse scraped data through the cache, timestamped for this run.
+    
+    A cache hit carries the timestamps of the run that first parsed the
+    records, and EndpointManager stores metadata.timestamp as the
+    endpoint's parsing_timestamp. st.cache_data hands out a fresh copy on
+    every call, so the copy is re-stamped without touching the cached
+    entry. model, tokens_used and parsing_time_ms still describe the LLM
+    call that produced the cached parse.
+    """
+    parsed_response = parse_scraped_data_cached(
+        execution_result,
+        scraped_data_key(execution_result),
+        user_requirements
+    )
+    parsed_at = datetime.utcnow()
+    parsed_response.metadata.timestamp = parsed_at
+    if parsed_response.source_metadata and 'timestamp' in parsed_response.source_metadata:
+        parsed_response.source_metadata['timestamp'] = str(parsed_at)
+    return parsed_response
 
 # Initialize API Server
-@st.cache_resource
 def initialize_api_server():
     """Initialize the API Server for serving parsed data as endpoints."""
     try:
         console_logger.section("API Server Initialization", "🔌")
         
         data_store = DataStore()
+        # The store keeps its SQLite connections open for the life of the
+        # process (one writer, one reader per thread); close them on exit
+        atexit.register(data_store.close)
         console_logger.success(f"DataStore initialized (db: {data_store.db_path})")
         
         endpoint_manager = EndpointManager(data_store)
@@ -182,6 +242,7 @@ def initialize_api_server():
         
         # Start the server
         base_url = api_server.start()
+        atexit.register(api_server.stop)
         endpoint_manager.set_base_url(base_url)
         
         console_logger.success(f"Server started at {base_url}")
@@ -192,7 +253,34 @@ def initialize_api_server():
         console_logger.error(f"API Server initialization failed: {str(e)}")
         return None, None, e
 
-api_server, endpoint_manager, api_server_error = initialize_api_server()
+# Both initializers are independent (HTTP client setup vs. SQLite open and
+# server socket bind), so they run concurrently on the first load
+@st.cache_resource
+def initialize_components():
+    """Initialize the AI layer and the API server in parallel."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        ai_future = pool.submit(initialize_ai_components)
+        api_future = pool.submit(initialize_api_server)
+        return ai_future.result(), api_future.result()
+
+(
+    (ai_components, config_error),
+    (api_server, endpoint_manager, api_server_error)
+) = initialize_components()
+
+# The sidebar is redrawn on every rerun (each widget interaction), so the
+# endpoint listing is cached per store change token and only re-read from
+# SQLite after an endpoint is created or deleted
+@st.cache_data(ttl=5, show_spinner=False)
+def list_endpoints_cached(_endpoint_manager, change_token: tuple) -> list:
+    """List endpoints for the sidebar as (EndpointInfo, title, created label) tuples."""
+    rows = []
+    for ep in _endpoint_manager.list_endpoints():
+        title = ep.description or ep.endpoint_id
+        if len(title) > 40:
+            title = title[:40] + "..."
+        rows.append((ep, title, ep.created_at.strftime('%m/%d %H:%M')))
+    return rows
 
 # Render header
 render_header()
@@ -224,23 +312,23 @@ with st.sidebar:
     
     if endpoint_manager and api_server and api_server.is_running():
         try:
-            endpoints = endpoint_manager.list_endpoints()
+            endpoints = list_endpoints_cached(
+                endpoint_manager, endpoint_manager.data_store.change_token()
+            )
             
             if endpoints:
                 st.caption(f"{len(endpoints)} endpoint(s) available")
                 
-                for ep in endpoints:
-                    display_title = ep.description[:40] + "..." if len(ep.description) > 40 else ep.description
-                    
+                for ep, display_title, created_label in endpoints:
                     with st.expander(f"🔗 {display_title}", expanded=False):
-                        st.markdown(f"**URL:**")
-                        st.code(ep.access_url, language="text")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.metric("Records", ep.records_count)
-                        with col2:
-                            st.caption(f"Created: {ep.created_at.strftime('%m/%d %H:%M')}")
+                        # One markdown block instead of a widget per line keeps
+                        # the per-rerun message count low with many endpoints
+                        st.markdown(
+                            f"**URL:** [{ep.access_url}]({ep.access_url})  \n"
+                            f"**ID:** `{ep.endpoint_id}`  \n"
+                            f"**Records:** {ep.records_count}  \n"
+                            f"**Created:** {created_label}"
+                        )
                         
                         if st.button("🗑️ Delete", key=f"del_{ep.endpoint_id}", use_container_width=True):
                             if endpoint_manager.delete_endpoint(ep.endpoint_id):
@@ -303,11 +391,9 @@ if form_data['submitted']:
         # Check if script generator is available
         if config_error:
             render_error(config_error)
-        elif standard_script_generator is None or light_script_generator is None:
+        elif ai_components is None:
             st.error("⚠️ Script Generator not initialized. Please check your configuration.")
         else:
-            # Choose the appropriate script generator based on toggle
-            script_generator = light_script_generator if form_data.get('use_light_scraping', False) else standard_script_generator
             scraping_mode = "Light Scraping (HTML + AI)" if form_data.get('use_light_scraping', False) else "Traditional Scraping (BeautifulSoup)"
             
             # Start colorful console logging for the entire workflow
@@ -319,8 +405,18 @@ if form_data['submitted']:
                     # PHASE 1: Script Generation
                     console_logger.log_script_generation_start(scraping_mode)
                     
-                    # Generate script (ONLY AI call now)
-                    generated_script = script_generator.generate_script(form_data)
+                    # Generate script (ONLY AI call now, cached for identical inputs)
+                    try:
+                        generated_script = generate_script_cached(
+                            form_data.get('use_light_scraping', False),
+                            form_data['data_description'],
+                            form_data['data_source'],
+                            form_data['desired_fields'],
+                            form_data['response_structure'],
+                            form_data['update_frequency']
+                        )
+                    except InvalidScriptResult as invalid:
+                        generated_script = invalid.generated_script
                     
                     # Log script generation results
                     console_logger.log_script_generation_complete(
@@ -328,7 +424,6 @@ if form_data['submitted']:
                         generated_script.metadata
                     )
                     
-                    print("\n" + "="*80)
                     # Show success message on UI
                     st.success(f"✅ Scraper script generated successfully using {scraping_mode}!")
                     
@@ -338,7 +433,8 @@ if form_data['submitted']:
                     generated_script = None
             
             # Execute the generated script if valid
-            if generated_script and generated_script.is_valid and executor:
+            if generated_script and generated_script.is_valid:
+                executor = ai_components.executor
                 # Execute with spinner, then display results outside spinner
                 execution_result = None
                 urls_to_try = []
@@ -350,18 +446,8 @@ if form_data['submitted']:
                         script_urls = _extract_all_urls_from_script(generated_script.script_code)
                         
                         # Build list of URLs to try (user URL first, then script URLs, avoiding duplicates)
-                        seen_urls = set()
-                        
-                        # Add user URL first (highest priority)
-                        if user_url and user_url not in seen_urls:
-                            urls_to_try.append(user_url)
-                            seen_urls.add(user_url)
-                        
-                        # Add script URLs (avoiding duplicates)
-                        for script_url in script_urls:
-                            if script_url not in seen_urls:
-                                urls_to_try.append(script_url)
-                                seen_urls.add(script_url)
+                        candidates = ([user_url] if user_url else []) + script_urls
+                        urls_to_try = list(dict.fromkeys(candidates))
                         
                         if not urls_to_try:
                             console_logger.warning("No target URL provided or found in script")
@@ -410,18 +496,12 @@ if form_data['submitted']:
                         # Show data preview in UI
                         st.subheader("📊 Extracted Data Preview")
                         
-                        # Show first few records
-                        import pandas as pd
-                        preview_data = execution_result.data[:10]
-                        
-                        # Clean up internal fields for display
-                        clean_data = []
-                        for record in preview_data:
-                            clean_record = {k: v for k, v in record.items() if not k.startswith('_')}
-                            clean_data.append(clean_record)
+                        # Show first few records, letting pandas build the
+                        # columns and then dropping internal (underscore) fields
+                        df = pd.DataFrame(execution_result.data[:10])
+                        df = df.drop(columns=[col for col in df.columns if str(col).startswith('_')])
                         
-                        if clean_data:
-                            df = pd.DataFrame(clean_data)
+                        if not df.columns.empty:
                             st.dataframe(df, use_container_width=True)
                         
                         if len(execution_result.data) > 10:
@@ -439,16 +519,16 @@ if form_data['submitted']:
                             
                             # Show source results if available
                             if execution_result.source_results:
-                                st.write("**Source Results:**")
-                                for sr in execution_result.source_results:
-                                    status = "✓" if sr.success else "✗"
-                                    st.write(f"{status} {sr.source_url}: {sr.record_count} records ({sr.scraping_method}, {sr.confidence} confidence)")
+                                st.markdown("  \n".join(["**Source Results:**"] + [
+                                    f"{'✓' if sr.success else '✗'} {sr.source_url}: {sr.record_count} records ({sr.scraping_method}, {sr.confidence} confidence)"
+                                    for sr in execution_result.source_results
+                                ]))
                             
                             st.write(f"**Scraping Method:** {execution_result.metadata.scraping_method}")
                             st.write(f"**Confidence:** {execution_result.metadata.confidence}")
                         
                         # PHASE 3: Parse scraped data into structured JSON
-                        if data_parser:
+                        if ai_components.data_parser:
                             st.markdown("---")
                             
                             # Parse with spinner
@@ -468,9 +548,9 @@ if form_data['submitted']:
                                     }
                                     
                                     # Parse the scraped data
-                                    parsed_response = data_parser.parse_scraped_data(
-                                        scraping_result=execution_result,
-                                        user_requirements=parser_requirements
+                                    parsed_response = parse_scraped_data(
+                                        execution_result,
+                                        parser_requirements
                                     )
                                     
                                     # Log parsing completion
@@ -489,7 +569,8 @@ if form_data['submitted']:
                             if parsed_response:
                                 render_parsed_response(parsed_response)
                                 
-                                # Store parsed_response in session state for API endpoint creation
+                                # Store parsed_response in session state for API endpoint creation;
+                                # it is freed with the session or once the endpoint is created
                                 st.session_state['last_parsed_response'] = parsed_response
                                 st.session_state['last_form_data'] = form_data
                                 st.session_state['show_create_endpoint'] = True
@@ -511,7 +592,7 @@ if form_data['submitted']:
 # API ENDPOINT CREATION SECTION (Outside form submission to handle button clicks)
 # ============================================================================
 if st.session_state.get('show_create_endpoint') and st.session_state.get('last_parsed_response'):
-    print("[CreateEndpoint] Session state has parsed response, showing create endpoint UI")
+    logger.debug("Session state has parsed response, showing create endpoint UI")
     
     if endpoint_manager:
         st.markdown("---")
@@ -553,6 +634,7 @@ if st.session_state.get('show_create_endpoint') and st.session_state.get('last_p
                     st.info(f"📊 {endpoint_info.records_count} records available at this endpoint")
                     
                     # Clear the create endpoint flag and trigger rerun to refresh sidebar
+                    st.session_state.pop('last_parsed_response', None)
                     st.session_state['show_create_endpoint'] = False
                     st.rerun()
                     
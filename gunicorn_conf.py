@@ -0,0 +1,18 @@
+"""
+Gunicorn settings for serving api_server.asgi:app with Uvicorn workers.
+
+Each worker is a separate process with its own interpreter, GIL and event
+loop, all reading the same SQLite database (WAL mode allows concurrent
+readers).
+
+    gunicorn -c gunicorn_conf.py api_server.asgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('API_SERVER_BIND', '127.0.0.1:8080')
+workers = int(os.environ.get('API_SERVER_WORKERS', 2 * multiprocessing.cpu_count() + 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+keepalive = 75
+backlog = 2048
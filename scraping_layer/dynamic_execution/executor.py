@@ -12,7 +12,7 @@ import traceback
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
 from .models import (
@@ -463,22 +463,20 @@ class DynamicScriptExecutor:
         total_filtered = 0
         total_duplicates = 0
         
+        # Per-source (result, error, time) in target_urls order
+        outcomes = self._iter_source_outcomes(script_code, target_urls, script_id)
+        
         # Use colorful progress logging if available
         if HAS_CONSOLE_LOGGER and console_logger:
             with console_logger.scraping_progress(target_urls) as progress:
                 for idx, url in enumerate(target_urls):
                     progress.start_url(url, idx)
-                    source_start = time.time()
+                    # Execute script for this URL (or collect its parallel run)
+                    result_data, error, source_time_ms = next(outcomes)
                     
                     try:
-                        # Execute script for this URL
-                        result_data = self._execute_with_timeout(
-                            script_code=script_code,
-                            target_url=url,
-                            script_id=f"{script_id}-{idx}"
-                        )
-                        
-                        source_time_ms = int((time.time() - source_start) * 1000)
+                        if error is not None:
+                            raise error
                         
                         # Process source result
                         source_result = self._process_source_result(
@@ -511,7 +509,6 @@ class DynamicScriptExecutor:
                             progress.complete_url(url, 0, success=False)
                             
                     except ScriptTimeoutError as e:
-                        source_time_ms = int((time.time() - source_start) * 1000)
                         source_results.append(SourceResult(
                             source_url=url,
                             success=False,
@@ -523,7 +520,6 @@ class DynamicScriptExecutor:
                         progress.complete_url(url, 0, success=False)
                         
                     except Exception as e:
-                        source_time_ms = int((time.time() - source_start) * 1000)
                         source_results.append(SourceResult(
                             source_url=url,
                             success=False,
@@ -539,17 +535,12 @@ class DynamicScriptExecutor:
             # Fallback to original behavior without rich logging
             for idx, url in enumerate(target_urls):
                 self.logger.info(f"[{script_id}] Processing source {idx + 1}/{len(target_urls)}: {url}")
-                source_start = time.time()
+                # Execute script for this URL (or collect its parallel run)
+                result_data, error, source_time_ms = next(outcomes)
                 
                 try:
-                    # Execute script for this URL
-                    result_data = self._execute_with_timeout(
-                        script_code=script_code,
-                        target_url=url,
-                        script_id=f"{script_id}-{idx}"
-                    )
-                    
-                    source_time_ms = int((time.time() - source_start) * 1000)
+                    if error is not None:
+                        raise error
                     
                     # Process source result
                     source_result = self._process_source_result(
@@ -587,7 +578,6 @@ class DynamicScriptExecutor:
                         )
                         
                 except ScriptTimeoutError as e:
-                    source_time_ms = int((time.time() - source_start) * 1000)
                     source_results.append(SourceResult(
                         source_url=url,
                         success=False,
@@ -599,7 +589,6 @@ class DynamicScriptExecutor:
                     self.logger.warning(f"[{script_id}] Source {idx + 1} timed out")
                     
                 except Exception as e:
-                    source_time_ms = int((time.time() - source_start) * 1000)
                     source_results.append(SourceResult(
                         source_url=url,
                         success=False,
@@ -643,6 +632,52 @@ class DynamicScriptExecutor:
             scraped_at=scraped_at
         )
     
+    def _iter_source_outcomes(
+        self,
+        script_code: str,
+        target_urls: List[str],
+        script_id: str
+    ) -> Iterator[Tuple[Any, Optional[Exception], int]]:
+        """
+        Run the script against each URL, yielding outcomes in URL order.
+        
+        With config.max_parallel_sources > 1 the sources are scraped
+        concurrently (each run gets its own sandbox globals); otherwise
+        each URL is executed only when its outcome is requested.
+        
+        Args:
+            script_code: Python code as string
+            target_urls: List of URLs to scrape
+            script_id: Script ID for logging
+            
+        Yields:
+            (result_data, error, execution_time_ms) for each URL, where
+            error is the exception raised by that run or None
+        """
+        def run(idx: int, url: str) -> Tuple[Any, Optional[Exception], int]:
+            source_start = time.time()
+            try:
+                result_data = self._execute_with_timeout(
+                    script_code=script_code,
+                    target_url=url,
+                    script_id=f"{script_id}-{idx}"
+                )
+                error = None
+            except Exception as e:
+                result_data, error = None, e
+            return result_data, error, int((time.time() - source_start) * 1000)
+        
+        max_workers = min(self.config.max_parallel_sources, len(target_urls))
+        if max_workers <= 1:
+            for idx, url in enumerate(target_urls):
+                yield run(idx, url)
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run, idx, url) for idx, url in enumerate(target_urls)]
+            for future in futures:
+                yield future.result()
+    
     def _process_source_result(
         self,
         result_data: Any,
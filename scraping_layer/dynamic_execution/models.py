@@ -18,6 +18,8 @@ class ExecutionConfig:
     timeout_seconds: int = 60
     max_memory_mb: int = 256
     allowed_imports: List[str] = None
+    # Sources scraped at once by execute_multi_source (1 = one after another)
+    max_parallel_sources: int = 1
     
     def __post_init__(self):
         if self.allowed_imports is None:
@@ -31,7 +33,8 @@ class ExecutionConfig:
         return {
             'timeout_seconds': self.timeout_seconds,
             'max_memory_mb': self.max_memory_mb,
-            'allowed_imports': self.allowed_imports
+            'allowed_imports': self.allowed_imports,
+            'max_parallel_sources': self.max_parallel_sources
         }
 
 
@@ -0,0 +1,64 @@
+"""
+Script URLs - Pull the target URLs out of AI-generated scraping scripts.
+
+Generated scripts list the pages to scrape at the top:
+    DEFAULT_URLS = ['https://site.com/data', 'https://other.com/info']
+"""
+
+import re
+from typing import Iterator
+
+
+# Patterns for pulling target URLs out of generated scripts. Both are
+# linear-time: the URL scanner has no alternation or nested quantifiers,
+# and quote context is checked in Python around each match. They are
+# bytes patterns run over the UTF-8 encoded script (ASCII-only matching
+# is cheaper than Unicode-aware matching); matched URLs are decoded back
+# to str.
+_DEFAULT_URLS_RE = re.compile(rb'DEFAULT_URLS\s*=\s*\[([^\]]*)\]')
+# URLs may contain ';' (e.g. ';jsessionid=') but never end in '.', ':' or ';',
+# so trailing punctuation stays out of the match
+_URL_RE = re.compile(rb'(?<![\w])https?://[^\s\'",]*[^\s\'",.:;]')
+# Upper bound (in bytes) on the DEFAULT_URLS list body that is scanned
+_MAX_URL_LIST_CHARS = 8192
+# Placeholder URLs in DEFAULT_URLS lists
+_PLACEHOLDER_URL_RE = re.compile(r'example\.com|example-')
+
+
+def _is_quoted(text: bytes, start: int, end: int) -> bool:
+    """Check whether text[start:end] is wrapped in quotes, ignoring trailing '.', ':' or ';'."""
+    if start == 0 or text[start - 1] not in b'\'"':
+        return False
+    while end < len(text) and text[end] in b'.:;':
+        end += 1
+    return end < len(text) and text[end] in b'\'"'
+
+
+def _iter_list_urls(urls_content: bytes) -> Iterator[str]:
+    """
+    Yield the quoted URLs in a DEFAULT_URLS list body, in order.
+    
+    Placeholder URLs (example.com, example-*) are skipped, and only the
+    first _MAX_URL_LIST_CHARS characters of the body are scanned.
+    """
+    urls_content = urls_content[:_MAX_URL_LIST_CHARS]
+    for url_match in _URL_RE.finditer(urls_content):
+        if not _is_quoted(urls_content, url_match.start(), url_match.end()):
+            continue
+        url = url_match.group().decode('utf-8', 'ignore')
+        # Non-ASCII whitespace (e.g. U+00A0) is not a URL character either
+        if not url.isascii() and any(char.isspace() for char in url):
+            continue
+        # Skip placeholder/example URLs
+        if not _PLACEHOLDER_URL_RE.search(url):
+            yield url
+
+
+def iter_script_urls(script_code: str) -> Iterator[str]:
+    """Yield the URLs in the generated script's DEFAULT_URLS list, in order."""
+    # Plain substring check first: skips the regex when there is no list
+    if not script_code or 'DEFAULT_URLS' not in script_code:
+        return
+    match = _DEFAULT_URLS_RE.search(script_code.encode('utf-8', 'ignore'))
+    if match:
+        yield from _iter_list_urls(match.group(1))
@@ -0,0 +1,77 @@
+"""
+Tests for extracting DEFAULT_URLS entries from generated scripts.
+
+Run:
+    python -m pytest utils/test/test_script_urls.py -v
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path so we can import utils
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.script_urls import iter_script_urls
+
+
+def baseline_extract_all_urls(script_code: str) -> list:
+    """The original regex-based extractor, kept as the reference behaviour."""
+    urls = []
+    match = re.search(r'DEFAULT_URLS\s*=\s*\[(.*?)\]', script_code, re.DOTALL)
+    if match:
+        for url in re.findall(r'[\'\"](https?://[^\s\'\"\,]+)[\'\"]\s*,?', match.group(1)):
+            url = url.strip().rstrip('.,;:\'\"')
+            if 'example.com' not in url and 'example-' not in url and url.startswith('http'):
+                urls.append(url)
+    return urls
+
+
+URL_CASES = [
+    # Quoted entries
+    ("single_quotes", "DEFAULT_URLS = ['https://a.com/data']", ["https://a.com/data"]),
+    ("double_quotes", 'DEFAULT_URLS = ["http://a.com/x", "https://b.org/y"]',
+     ["http://a.com/x", "https://b.org/y"]),
+    ("multiline", "DEFAULT_URLS = [\n    'https://a.com/1',  # first\n    'https://b.com/2',\n]\n",
+     ["https://a.com/1", "https://b.com/2"]),
+    ("unquoted", "DEFAULT_URLS = [https://a.com, url]", []),
+    ("no_list", "url = 'https://a.com'", []),
+    ("empty_script", "", []),
+    # Characters allowed inside a URL
+    ("semicolon_param", "DEFAULT_URLS = ['https://a.com/p;jsessionid=1']",
+     ["https://a.com/p;jsessionid=1"]),
+    ("angle_brackets", "DEFAULT_URLS = ['https://a.com/q?x=<1>']", ["https://a.com/q?x=<1>"]),
+    ("query_and_fragment", "DEFAULT_URLS = ['https://a.com/s?q=1&b=2#top']",
+     ["https://a.com/s?q=1&b=2#top"]),
+    ("comma_inside", "DEFAULT_URLS = ['https://a.com/a,b', 'https://b.com']", ["https://b.com"]),
+    # Trailing punctuation
+    ("trailing_dot", "DEFAULT_URLS = ['https://a.com/page.']", ["https://a.com/page"]),
+    ("trailing_colon", "DEFAULT_URLS = ['https://a.com:']", ["https://a.com"]),
+    ("trailing_semicolon", "DEFAULT_URLS = ['https://a.com/p;']", ["https://a.com/p"]),
+    ("trailing_mixed", "DEFAULT_URLS = ['https://a.com/p.;:.']", ["https://a.com/p"]),
+    ("port", "DEFAULT_URLS = ['http://localhost:8000/api']", ["http://localhost:8000/api"]),
+    # Placeholders
+    ("placeholder_domain", "DEFAULT_URLS = ['https://example.com/data', 'https://a.com']",
+     ["https://a.com"]),
+    ("placeholder_prefix", "DEFAULT_URLS = ['https://example-site.org/x']", []),
+    ("placeholder_in_path", "DEFAULT_URLS = ['https://a.com/example-page']", []),
+    # Non-ASCII
+    ("non_ascii_host", "DEFAULT_URLS = ['https://例え.jp/パス']", ["https://例え.jp/パス"]),
+    ("non_ascii_path", 'DEFAULT_URLS = ["https://de.wikipedia.org/wiki/Köln."]',
+     ["https://de.wikipedia.org/wiki/Köln"]),
+    ("non_ascii_space", "DEFAULT_URLS = ['https://a.com/x\u00a0y', 'https://b.com']",
+     ["https://b.com"]),
+]
+
+
+@pytest.mark.parametrize(
+    "script_code, expected",
+    [case[1:] for case in URL_CASES],
+    ids=[case[0] for case in URL_CASES],
+)
+def test_iter_script_urls_matches_baseline(script_code, expected):
+    """The linear-time scanner returns what the original extractor did."""
+    assert baseline_extract_all_urls(script_code) == expected
+    assert list(iter_script_urls(script_code)) == expected